@@ -0,0 +1,86 @@
+"""initial schema
+
+Matches the tables previously created by Base.metadata.create_all. Existing
+databases created that way should be marked as migrated with
+`alembic stamp 0001` before running `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+risk_level = sa.Enum("baixo", "medio", "alto", name="risklevel")
+category = sa.Enum("exercicio", "alimentacao", "medicacao", "social", name="category")
+adherence = sa.Enum("full", "partial", "none", name="adherence")
+
+
+def upgrade():
+    op.create_table(
+        "elderly",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=False),
+        sa.Column("current_week", sa.Integer()),
+        sa.Column("start_date", sa.Date()),
+        sa.Column("risk_level", risk_level),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("caregiver_phone", sa.String(20)),
+        sa.Column("responsible_person", sa.String(255), nullable=False),
+        sa.Column("health_conditions", sa.Text()),
+        sa.Column("observations", sa.Text()),
+        sa.Column("created_at", sa.Date()),
+        sa.Column("updated_at", sa.Date()),
+    )
+    op.create_index("ix_elderly_id", "elderly", ["id"])
+
+    op.create_table(
+        "recommendations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("elderly_id", sa.Integer(), sa.ForeignKey("elderly.id"), nullable=False),
+        sa.Column("week", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date()),
+        sa.Column("category", category, nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("adherence", adherence),
+        sa.Column("created_at", sa.Date()),
+        sa.Column("updated_at", sa.Date()),
+    )
+    op.create_index("ix_recommendations_id", "recommendations", ["id"])
+
+    op.create_table(
+        "reminders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("elderly_id", sa.Integer(), sa.ForeignKey("elderly.id"), nullable=False),
+        sa.Column("scheduled_date", sa.Date(), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("sent", sa.Boolean()),
+        sa.Column("sent_at", sa.Date()),
+        sa.Column("created_at", sa.Date()),
+        sa.Column("updated_at", sa.Date()),
+    )
+    op.create_index("ix_reminders_id", "reminders", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_reminders_id", table_name="reminders")
+    op.drop_table("reminders")
+    op.drop_index("ix_recommendations_id", table_name="recommendations")
+    op.drop_table("recommendations")
+    op.drop_index("ix_elderly_id", table_name="elderly")
+    op.drop_table("elderly")
+
+    bind = op.get_bind()
+    for enum_type in (adherence, category, risk_level):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,25 @@
+"""reminder delivery queue
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("reminders", sa.Column("queued_at", sa.DateTime()))
+
+
+def downgrade():
+    with op.batch_alter_table("reminders") as batch_op:
+        batch_op.drop_column("queued_at")
@@ -0,0 +1,53 @@
+"""composite and partial indexes for the hot queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Built from typed columns so each dialect renders the predicate exactly the
+# way the ORM renders the query filters (sent = false / sent = 0)
+reminders = sa.table("reminders", sa.column("sent", sa.Boolean), sa.column("queued_at", sa.DateTime))
+UNSENT = reminders.c.sent == sa.false()
+QUEUED = sa.and_(reminders.c.sent == sa.false(), reminders.c.queued_at.isnot(None))
+
+
+def upgrade():
+    # read_recommendations: filters on elderly_id / week / category, ordered by (week, id)
+    op.create_index("ix_recommendations_elderly_id_week", "recommendations", ["elderly_id", "week", "id"])
+    op.create_index("ix_recommendations_week", "recommendations", ["week", "id"])
+    op.create_index("ix_recommendations_category_week", "recommendations", ["category", "week", "id"])
+
+    # read_reminders: filters on elderly_id / scheduled_date, ordered by (scheduled_date, id)
+    op.create_index("ix_reminders_elderly_id_scheduled_date", "reminders", ["elderly_id", "scheduled_date", "id"])
+    op.create_index("ix_reminders_scheduled_date", "reminders", ["scheduled_date", "id"])
+
+    # send-due and the delivery worker only ever look at unsent reminders
+    op.create_index(
+        "ix_reminders_unsent_scheduled_date", "reminders", ["scheduled_date", "id"],
+        postgresql_where=UNSENT, sqlite_where=UNSENT
+    )
+    op.create_index(
+        "ix_reminders_queued", "reminders", ["queued_at", "id"],
+        postgresql_where=QUEUED, sqlite_where=QUEUED
+    )
+
+
+def downgrade():
+    op.drop_index("ix_reminders_queued", table_name="reminders")
+    op.drop_index("ix_reminders_unsent_scheduled_date", table_name="reminders")
+    op.drop_index("ix_reminders_scheduled_date", table_name="reminders")
+    op.drop_index("ix_reminders_elderly_id_scheduled_date", table_name="reminders")
+    op.drop_index("ix_recommendations_category_week", table_name="recommendations")
+    op.drop_index("ix_recommendations_week", table_name="recommendations")
+    op.drop_index("ix_recommendations_elderly_id_week", table_name="recommendations")
@@ -0,0 +1,52 @@
+"""adherence summary table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# The enum types already exist on PostgreSQL (created with their tables in 0001)
+category = sa.Enum("exercicio", "alimentacao", "medicacao", "social", name="category").with_variant(
+    postgresql.ENUM(name="category", create_type=False), "postgresql"
+)
+risk_level = sa.Enum("baixo", "medio", "alto", name="risklevel").with_variant(
+    postgresql.ENUM(name="risklevel", create_type=False), "postgresql"
+)
+
+
+def upgrade():
+    op.create_table(
+        "adherence_summary",
+        sa.Column("week", sa.Integer(), primary_key=True),
+        sa.Column("category", category, primary_key=True),
+        sa.Column("risk_level", risk_level, primary_key=True),
+        sa.Column("adherence", sa.String(10), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+    # Backfill from the existing recommendations
+    op.execute(
+        """
+        INSERT INTO adherence_summary (week, category, risk_level, adherence, count)
+        SELECT r.week, r.category, COALESCE(e.risk_level, 'baixo'),
+               COALESCE(CAST(r.adherence AS VARCHAR(10)), 'pending'), COUNT(*)
+        FROM recommendations r
+        JOIN elderly e ON e.id = r.elderly_id
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("adherence_summary")
@@ -0,0 +1,34 @@
+"""server-side created_at/updated_at defaults
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLES = ("elderly", "recommendations", "reminders")
+
+
+def upgrade():
+    # The ORM used to send the date the application was started; let the
+    # database stamp rows instead (updated_at is also set by every UPDATE)
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("created_at", existing_type=sa.Date(), server_default=sa.func.current_date())
+            batch_op.alter_column("updated_at", existing_type=sa.Date(), server_default=sa.func.current_date())
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column("created_at", existing_type=sa.Date(), server_default=None)
+            batch_op.alter_column("updated_at", existing_type=sa.Date(), server_default=None)
@@ -0,0 +1,40 @@
+"""ON DELETE CASCADE from elderly to recommendations and reminders
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+TABLES = ("recommendations", "reminders")
+
+# The foreign keys were created unnamed. This matches the names PostgreSQL
+# gave them, and names SQLite's reflected ones the same way for batch mode.
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def _replace_foreign_key(table, ondelete):
+    name = f"{table}_elderly_id_fkey"
+    with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_="foreignkey")
+        batch_op.create_foreign_key(name, "elderly", ["elderly_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade():
+    # Deleting an elderly person becomes a single statement; their
+    # recommendations and reminders are removed by the database
+    for table in TABLES:
+        _replace_foreign_key(table, "CASCADE")
+
+
+def downgrade():
+    for table in TABLES:
+        _replace_foreign_key(table, None)
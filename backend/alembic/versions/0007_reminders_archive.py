@@ -0,0 +1,168 @@
+"""reminders archive table, optional monthly partitioning of reminders
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:00:00
+
+On PostgreSQL, reminders can also be range-partitioned by scheduled_date,
+one partition per month plus a default one. This rewrites the table, so it
+is opt-in:
+
+    alembic -x partition_reminders=true upgrade head
+
+Pass the same flag to downgrade a partitioned table when emitting offline SQL.
+"""
+from datetime import date
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of today; scripts.archive_reminders keeps adding them
+PARTITION_MONTHS_AHEAD = 12
+
+REMINDER_COLUMNS = (
+    "id, elderly_id, scheduled_date, email, subject, message, sent, sent_at, created_at, updated_at, queued_at"
+)
+
+
+def _partition_requested() -> bool:
+    value = context.get_x_argument(as_dictionary=True).get("partition_reminders", "false")
+    return value.lower() in ("1", "true", "yes")
+
+
+def _reminders_partitioned() -> bool:
+    if context.is_offline_mode():
+        return _partition_requested()
+    return op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'reminders')"
+    )).scalar()
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _create_reminder_indexes():
+    sent = sa.column("sent")
+    op.create_index("ix_reminders_id", "reminders", ["id"])
+    op.create_index("ix_reminders_elderly_id_scheduled_date", "reminders", ["elderly_id", "scheduled_date", "id"])
+    op.create_index("ix_reminders_scheduled_date", "reminders", ["scheduled_date", "id"])
+    op.create_index(
+        "ix_reminders_unsent_scheduled_date", "reminders", ["scheduled_date", "id"],
+        postgresql_where=sent == sa.false(),
+    )
+    op.create_index(
+        "ix_reminders_queued", "reminders", ["queued_at", "id"],
+        postgresql_where=(sent == sa.false()) & sa.column("queued_at").isnot(None),
+    )
+
+
+def _rebuild_reminders(partitioned: bool):
+    """
+    Recreate reminders (partitioned or not) and copy the rows over,
+    keeping its ID sequence
+    """
+    op.execute("ALTER TABLE reminders RENAME TO reminders_old")
+    op.execute("ALTER TABLE reminders_old RENAME CONSTRAINT reminders_pkey TO reminders_old_pkey")
+    op.execute("ALTER SEQUENCE reminders_id_seq OWNED BY NONE")
+    # A partitioned table's primary key must include the partition key
+    primary_key = "id, scheduled_date" if partitioned else "id"
+    op.execute(
+        f"""
+        CREATE TABLE reminders (
+            id INTEGER NOT NULL DEFAULT nextval('reminders_id_seq'),
+            elderly_id INTEGER NOT NULL,
+            scheduled_date DATE NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            sent BOOLEAN,
+            sent_at DATE,
+            created_at DATE DEFAULT CURRENT_DATE,
+            updated_at DATE DEFAULT CURRENT_DATE,
+            queued_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT reminders_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT reminders_elderly_id_fkey FOREIGN KEY (elderly_id) REFERENCES elderly (id) ON DELETE CASCADE
+        ){" PARTITION BY RANGE (scheduled_date)" if partitioned else ""}
+        """
+    )
+
+    if partitioned:
+        today = date.today()
+        first = today
+        if not context.is_offline_mode():
+            first = op.get_bind().execute(sa.text("SELECT MIN(scheduled_date) FROM reminders_old")).scalar() or today
+        start = _month_start(min(first, today))
+        end = _month_start(today, PARTITION_MONTHS_AHEAD + 1)
+        while start < end:
+            op.execute(
+                f"CREATE TABLE reminders_p{start:%Y_%m} PARTITION OF reminders "
+                f"FOR VALUES FROM ('{start}') TO ('{_month_start(start, 1)}')"
+            )
+            start = _month_start(start, 1)
+        op.execute("CREATE TABLE reminders_default PARTITION OF reminders DEFAULT")
+
+    op.execute(f"INSERT INTO reminders ({REMINDER_COLUMNS}) SELECT {REMINDER_COLUMNS} FROM reminders_old")
+    op.execute("DROP TABLE reminders_old CASCADE")
+    op.execute("ALTER SEQUENCE reminders_id_seq OWNED BY reminders.id")
+    _create_reminder_indexes()
+
+
+def _set_sqlite_autoincrement(enabled: bool):
+    """
+    Without AUTOINCREMENT, SQLite reuses the highest IDs once their rows are
+    deleted, and archived reminders would share IDs with new ones
+    """
+    with op.batch_alter_table("reminders", recreate="always", table_kwargs={"sqlite_autoincrement": enabled}):
+        pass
+
+
+def upgrade():
+    op.create_table(
+        "reminders_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("elderly_id", sa.Integer(), sa.ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("scheduled_date", sa.Date(), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("sent", sa.Boolean(), nullable=False),
+        sa.Column("sent_at", sa.Date()),
+        sa.Column("created_at", sa.Date()),
+        sa.Column("updated_at", sa.Date()),
+        sa.Column("archived_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_reminders_archive_elderly_id_scheduled_date", "reminders_archive", ["elderly_id", "scheduled_date", "id"]
+    )
+    op.create_index("ix_reminders_archive_scheduled_date", "reminders_archive", ["scheduled_date", "id"])
+
+    if op.get_context().dialect.name == "sqlite":
+        _set_sqlite_autoincrement(True)
+    elif _partition_requested() and op.get_context().dialect.name == "postgresql":
+        _rebuild_reminders(partitioned=True)
+
+
+def downgrade():
+    if op.get_context().dialect.name == "postgresql" and _reminders_partitioned():
+        _rebuild_reminders(partitioned=False)
+    elif op.get_context().dialect.name == "sqlite":
+        _set_sqlite_autoincrement(False)
+
+    # Archived reminders go back to the reminders table
+    op.execute(
+        "INSERT INTO reminders (id, elderly_id, scheduled_date, email, subject, message, sent, sent_at, "
+        "created_at, updated_at) SELECT id, elderly_id, scheduled_date, email, subject, message, sent, sent_at, "
+        "created_at, updated_at FROM reminders_archive"
+    )
+    op.drop_index("ix_reminders_archive_scheduled_date", table_name="reminders_archive")
+    op.drop_index("ix_reminders_archive_elderly_id_scheduled_date", table_name="reminders_archive")
+    op.drop_table("reminders_archive")
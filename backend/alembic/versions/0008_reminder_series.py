@@ -0,0 +1,63 @@
+"""recurring reminder series
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "reminder_series",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("elderly_id", sa.Integer(), sa.ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("rrule", sa.String(255), nullable=False),
+        sa.Column("dtstart", sa.Date(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("next_occurrence", sa.Date()),
+        sa.Column("created_at", sa.Date(), server_default=sa.func.current_date()),
+        sa.Column("updated_at", sa.Date(), server_default=sa.func.current_date()),
+    )
+    op.create_index("ix_reminder_series_id", "reminder_series", ["id"])
+    op.create_index("ix_reminder_series_elderly_id", "reminder_series", ["elderly_id"])
+    op.create_index(
+        "ix_reminder_series_next_occurrence", "reminder_series", ["next_occurrence", "id"],
+        postgresql_where=sa.column("active") == sa.true(),
+        sqlite_where=sa.column("active") == sa.true(),
+    )
+
+    # Occurrences are reminders pointing at their series; sent ones outlive it
+    # SQLite recreates the table: keep its AUTOINCREMENT (added in 0007)
+    with op.batch_alter_table("reminders", table_kwargs={"sqlite_autoincrement": True}) as batch_op:
+        batch_op.add_column(sa.Column("series_id", sa.Integer()))
+        batch_op.create_foreign_key(
+            "reminders_series_id_fkey", "reminder_series", ["series_id"], ["id"], ondelete="SET NULL"
+        )
+        batch_op.create_unique_constraint("uq_reminders_series_id_scheduled_date", ["series_id", "scheduled_date"])
+    op.add_column("reminders_archive", sa.Column("series_id", sa.Integer()))
+
+
+def downgrade():
+    op.drop_column("reminders_archive", "series_id")
+    # SQLite recreates the table: keep its AUTOINCREMENT (added in 0007)
+    with op.batch_alter_table("reminders", table_kwargs={"sqlite_autoincrement": True}) as batch_op:
+        batch_op.drop_constraint("uq_reminders_series_id_scheduled_date", type_="unique")
+        batch_op.drop_constraint("reminders_series_id_fkey", type_="foreignkey")
+        batch_op.drop_column("series_id")
+    op.drop_index("ix_reminder_series_next_occurrence", table_name="reminder_series")
+    op.drop_index("ix_reminder_series_elderly_id", table_name="reminder_series")
+    op.drop_index("ix_reminder_series_id", table_name="reminder_series")
+    op.drop_table("reminder_series")
@@ -0,0 +1,45 @@
+"""reminder delivery attempts, retry schedule and dead letters
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("reminders", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("reminders", sa.Column("last_error", sa.Text()))
+    op.add_column("reminders", sa.Column("next_attempt_at", sa.DateTime()))
+    op.add_column("reminders", sa.Column("dead_lettered_at", sa.DateTime()))
+    op.create_index(
+        "ix_reminders_dead_lettered", "reminders", ["dead_lettered_at", "id"],
+        postgresql_where=sa.column("dead_lettered_at").isnot(None),
+        sqlite_where=sa.column("dead_lettered_at").isnot(None),
+    )
+
+    # Sent reminders keep their delivery history when archived
+    op.add_column("reminders_archive", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("reminders_archive", sa.Column("last_error", sa.Text()))
+
+
+def downgrade():
+    with op.batch_alter_table("reminders_archive") as batch_op:
+        batch_op.drop_column("last_error")
+        batch_op.drop_column("attempts")
+    op.drop_index("ix_reminders_dead_lettered", table_name="reminders")
+    # SQLite recreates the table: keep its AUTOINCREMENT (added in 0007)
+    with op.batch_alter_table("reminders", table_kwargs={"sqlite_autoincrement": True}) as batch_op:
+        batch_op.drop_column("dead_lettered_at")
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("last_error")
+        batch_op.drop_column("attempts")
@@ -0,0 +1,52 @@
+"""sms recipients of reminders
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+sms_status = sa.Enum("pending", "sent", "failed", name="smsstatus")
+
+
+def upgrade():
+    # reminder_id has no foreign key: a partitioned reminders table (see 0007)
+    # has a composite primary key, and rows outlive archived reminders
+    op.create_table(
+        "sms_recipients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("reminder_id", sa.Integer(), nullable=False),
+        sa.Column("elderly_id", sa.Integer(), sa.ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("phone", sa.String(20), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("status", sms_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("provider_id", sa.String(64)),
+        sa.Column("next_attempt_at", sa.DateTime()),
+        sa.Column("sent_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.UniqueConstraint("reminder_id", "phone", name="uq_sms_recipients_reminder_id_phone"),
+    )
+    op.create_index("ix_sms_recipients_phone", "sms_recipients", ["phone", "id"])
+    op.create_index(
+        "ix_sms_recipients_pending", "sms_recipients", ["id"],
+        postgresql_where=sa.column("status") == "pending",
+        sqlite_where=sa.column("status") == "pending",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_sms_recipients_pending", table_name="sms_recipients")
+    op.drop_index("ix_sms_recipients_phone", table_name="sms_recipients")
+    op.drop_table("sms_recipients")
+    sms_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Optional
+from app.database_async import get_async_db, get_async_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.services import adherence_summary
+from app.models import Elderly as ElderlyModel, Recommendation as RecommendationModel
+from app.schemas import ElderlyCreate, Elderly, ElderlyUpdate, ElderlyWithRecommendations, ElderlyListItem
+from app.serialization import rows_to_content, select_fields
+from app.routes.elderly import LIST_ORDER, LIST_COLUMNS, LIST_DEFERRED, FIELDS_QUERY, apply_update
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _get_elderly(db: AsyncSession, elderly_id: int, lock: bool = False):
+    stmt = select(ElderlyModel).where(ElderlyModel.id == elderly_id)
+    db_elderly = await db.scalar(stmt.with_for_update() if lock else stmt)
+    if not db_elderly:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+    return db_elderly
+
+@router.post("/", response_model=Elderly, status_code=status.HTTP_201_CREATED)
+async def create_elderly(elderly: ElderlyCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new elderly person
+    """
+    db_elderly = ElderlyModel(**elderly.dict())
+    db.add(db_elderly)
+    await db.commit()
+    await db.refresh(db_elderly)
+    read_cache.invalidate_lists("elderly")
+    logger.info(f"Created elderly person: {db_elderly.name}")
+    return db_elderly
+
+@router.get("/", response_model=List[ElderlyListItem])
+async def read_elderly_list(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a list of elderly people ordered by ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id`) are read; without it, everything
+    but the long free-text fields is returned.
+    """
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
+
+    async def load():
+        rows = (await db.execute(paginate(select(*columns), LIST_ORDER, cursor, skip, limit))).all()
+        return rows_to_content(rows), next_cursor_headers(rows, LIST_ORDER, limit)
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns]}
+    return await read_cache.response_async("elderly", params, load, response_class=ORJSONResponse, db=db)
+
+@router.get("/{elderly_id}", response_model=ElderlyWithRecommendations)
+async def read_elderly(
+    elderly_id: int,
+    include_recommendations: bool = True,
+    recommendations_limit: int = Query(20, ge=1, le=500),
+    recommendations_week: Optional[int] = Query(None, ge=1, le=16),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get an elderly person by ID with their latest recommendations (newest first).
+    Use recommendations_week to embed a single week instead, or
+    include_recommendations=false to skip them altogether.
+    """
+    async def load():
+        elderly = await _get_elderly(db, elderly_id)
+
+        recommendations = []
+        if include_recommendations:
+            stmt = select(RecommendationModel).where(RecommendationModel.elderly_id == elderly_id)
+            if recommendations_week:
+                stmt = stmt.where(RecommendationModel.week == recommendations_week)
+            stmt = stmt.order_by(
+                RecommendationModel.week.desc(), RecommendationModel.id.desc()
+            ).limit(recommendations_limit)
+            recommendations = (await db.scalars(stmt)).all()
+        set_committed_value(elderly, "recommendations", recommendations)
+        return jsonable_encoder(ElderlyWithRecommendations.from_orm(elderly)), {}
+
+    params = {
+        "include_recommendations": include_recommendations,
+        "recommendations_limit": recommendations_limit,
+        "recommendations_week": recommendations_week
+    }
+    return await read_cache.response_async("elderly", params, load, item_id=elderly_id, db=db)
+
+@router.put("/{elderly_id}", response_model=Elderly)
+async def update_elderly(elderly_id: int, elderly: ElderlyUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Update an elderly person
+    """
+    # Update fields that are provided
+    row = await db.run_sync(apply_update, elderly_id, elderly.dict(exclude_unset=True))
+    await db.commit()
+    read_cache.invalidate_item("elderly", elderly_id)
+    logger.info(f"Updated elderly person: {row['name']}")
+    return row
+
+@router.delete("/{elderly_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_elderly(elderly_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Delete an elderly person
+    """
+    # Locked, so that their risk level and recommendations cannot change before they are gone
+    db_elderly = await _get_elderly(db, elderly_id, lock=True)
+
+    await db.run_sync(adherence_summary.record_elderly_deleted, elderly_id, db_elderly.risk_level)
+    await db.delete(db_elderly)
+    await db.commit()
+    read_cache.invalidate_item("elderly", elderly_id)
+    # Their recommendations and reminders are gone too
+    read_cache.invalidate_namespace("recommendations")
+    read_cache.invalidate_namespace("reminders")
+    logger.info(f"Deleted elderly person with ID: {elderly_id}")
+    return None
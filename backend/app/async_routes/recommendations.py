@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database_async import get_async_db, get_async_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.models import Recommendation as RecommendationModel, Elderly as ElderlyModel
+from app.schemas import RecommendationCreate, Recommendation, RecommendationUpdate, RecommendationAdherenceUpdate
+from app.schemas import RecommendationBulkCreate, RecommendationBulkResult, BulkItemError, RecommendationListItem
+from app.services import adherence_summary
+from app.serialization import rows_to_content, select_fields
+from app.routes.recommendations import (
+    LIST_ORDER, LIST_COLUMNS, LIST_DEFERRED, FIELDS_QUERY, filter_recommendations, export_recommendations,
+    apply_update, delete_row, _summary_key, _invalidate_recommendation
+)
+import logging
+from datetime import date
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _get_recommendation(db: AsyncSession, recommendation_id: int):
+    db_recommendation = await db.scalar(
+        select(RecommendationModel).where(RecommendationModel.id == recommendation_id)
+    )
+    if not db_recommendation:
+        raise HTTPException(status_code=404, detail="Recommendation not found")
+    return db_recommendation
+
+@router.post("/", response_model=Recommendation, status_code=status.HTTP_201_CREATED)
+async def create_recommendation(recommendation: RecommendationCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new recommendation for an elderly person
+    """
+    # Check if elderly exists, locking their risk level until the summary is updated
+    elderly = await db.scalar(
+        select(ElderlyModel).where(ElderlyModel.id == recommendation.elderly_id).with_for_update(read=True)
+    )
+    if not elderly:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+
+    # Create recommendation
+    db_recommendation = RecommendationModel(
+        elderly_id=recommendation.elderly_id,
+        week=recommendation.week,
+        date=recommendation.date or date.today(),
+        category=recommendation.category,
+        content=recommendation.content,
+        adherence=recommendation.adherence
+    )
+    db.add(db_recommendation)
+    await db.run_sync(adherence_summary.record_created, [_summary_key(db_recommendation, elderly.risk_level)])
+    await db.commit()
+    await db.refresh(db_recommendation)
+    read_cache.invalidate_lists("recommendations")
+    # The elderly profile embeds their latest recommendations
+    read_cache.invalidate_item("elderly", recommendation.elderly_id, lists=False)
+    logger.info(f"Created recommendation for elderly ID {recommendation.elderly_id}")
+    return db_recommendation
+
+@router.post("/bulk", response_model=RecommendationBulkResult, status_code=status.HTTP_201_CREATED)
+async def create_recommendations_bulk(bulk: RecommendationBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many recommendations at once (up to 10,000 items).
+    Items for unknown elderly people are reported in `errors` by their index;
+    every other item is created.
+    """
+    # Validate every elderly ID with one query
+    requested_ids = {item.elderly_id for item in bulk.items}
+    risk_levels = dict((await db.execute(
+        select(ElderlyModel.id, ElderlyModel.risk_level)
+        .where(ElderlyModel.id.in_(requested_ids))
+        .with_for_update(read=True)
+    )).all())
+
+    rows = []
+    errors = []
+    today = date.today()
+    for index, item in enumerate(bulk.items):
+        if item.elderly_id not in risk_levels:
+            errors.append(BulkItemError(index=index, elderly_id=item.elderly_id, detail="Elderly person not found"))
+            continue
+        rows.append({
+            "elderly_id": item.elderly_id,
+            "week": item.week,
+            "date": item.date or today,
+            "category": item.category,
+            "content": item.content,
+            "adherence": item.adherence
+        })
+
+    # Multi-row INSERT ... RETURNING instead of one round trip per row
+    created = []
+    if rows:
+        inserted = await db.scalars(insert(RecommendationModel).returning(RecommendationModel), rows)
+        created = [Recommendation.from_orm(row) for row in inserted]
+        await db.run_sync(adherence_summary.record_created, [
+            adherence_summary.summary_key(row["week"], row["category"], risk_levels[row["elderly_id"]], row["adherence"])
+            for row in rows
+        ])
+        await db.commit()
+        read_cache.invalidate_lists("recommendations")
+        for elderly_id in {row["elderly_id"] for row in rows}:
+            read_cache.invalidate_item("elderly", elderly_id, lists=False)
+    logger.info(f"Bulk created {len(created)} recommendations ({len(errors)} rejected)")
+    return RecommendationBulkResult(created=created, errors=errors)
+
+@router.get("/", response_model=List[RecommendationListItem])
+async def read_recommendations(
+    elderly_id: int = None,
+    week: int = None,
+    category: str = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a list of recommendations with optional filtering, ordered by week and ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id` and `week`) are read; without it,
+    everything but `content` is returned.
+    """
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
+
+    async def load():
+        stmt = filter_recommendations(select(*columns), elderly_id, week, category)
+        rows = (await db.execute(paginate(stmt, LIST_ORDER, cursor, skip, limit))).all()
+        return rows_to_content(rows), next_cursor_headers(rows, LIST_ORDER, limit)
+
+    params = {
+        "elderly_id": elderly_id, "week": week, "category": category,
+        "skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns]
+    }
+    return await read_cache.response_async("recommendations", params, load, response_class=ORJSONResponse, db=db)
+
+# The export streams from its own session in a worker thread; share the sync handler
+router.add_api_route("/export", export_recommendations, methods=["GET"])
+
+@router.get("/{recommendation_id}", response_model=Recommendation)
+async def read_recommendation(recommendation_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get a recommendation by ID
+    """
+    async def load():
+        recommendation = await _get_recommendation(db, recommendation_id)
+        return jsonable_encoder(Recommendation.from_orm(recommendation)), {}
+
+    return await read_cache.response_async("recommendations", {}, load, item_id=recommendation_id, db=db)
+
+@router.put("/{recommendation_id}", response_model=Recommendation)
+async def update_recommendation(
+    recommendation_id: int,
+    recommendation: RecommendationUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a recommendation
+    """
+    # Update fields that are provided
+    row = await db.run_sync(apply_update, recommendation_id, recommendation.dict(exclude_unset=True))
+    await db.commit()
+    _invalidate_recommendation(recommendation_id, row["elderly_id"])
+    logger.info(f"Updated recommendation ID {recommendation_id}")
+    return row
+
+@router.patch("/{recommendation_id}/adherence", response_model=Recommendation)
+async def update_recommendation_adherence(
+    recommendation_id: int,
+    adherence_update: RecommendationAdherenceUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update only the adherence status of a recommendation
+    """
+    row = await db.run_sync(apply_update, recommendation_id, {"adherence": adherence_update.adherence})
+    await db.commit()
+    _invalidate_recommendation(recommendation_id, row["elderly_id"])
+    logger.info(f"Updated adherence for recommendation ID {recommendation_id} to {adherence_update.adherence}")
+    return row
+
+@router.delete("/{recommendation_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recommendation(recommendation_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Delete a recommendation
+    """
+    elderly_id = await db.run_sync(delete_row, recommendation_id)
+    await db.commit()
+    _invalidate_recommendation(recommendation_id, elderly_id)
+    logger.info(f"Deleted recommendation ID {recommendation_id}")
+    return None
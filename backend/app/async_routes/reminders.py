@@ -0,0 +1,171 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database_async import get_async_db, get_async_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.models import Reminder as ReminderModel, ReminderArchive, Elderly as ElderlyModel, SmsRecipient
+from app.schemas import ReminderCreate, Reminder, ReminderUpdate, ReminderListItem
+from app.services.reminder_dispatch import enqueue_reminder, enqueue_due_reminders
+from app.serialization import rows_to_content, select_fields
+from app.routes.reminders import LIST_ORDER, LIST_COLUMNS, LIST_DEFERRED, FIELDS_QUERY, INCLUDE_ARCHIVED_QUERY
+from app.routes.reminders import DEAD_LETTER_QUERY
+from app.routes.reminders import apply_update, list_statement
+import logging
+from datetime import date
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _get_reminder(db: AsyncSession, reminder_id: int):
+    db_reminder = await db.scalar(select(ReminderModel).where(ReminderModel.id == reminder_id))
+    if not db_reminder:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return db_reminder
+
+@router.post("/", response_model=Reminder, status_code=status.HTTP_201_CREATED)
+async def create_reminder(reminder: ReminderCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new reminder for an elderly person
+    """
+    # Check if elderly exists
+    elderly = await db.scalar(select(ElderlyModel).where(ElderlyModel.id == reminder.elderly_id))
+    if not elderly:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+
+    # Create reminder
+    db_reminder = ReminderModel(
+        elderly_id=reminder.elderly_id,
+        scheduled_date=reminder.scheduled_date,
+        email=reminder.email,
+        subject=reminder.subject,
+        message=reminder.message,
+        sent=False
+    )
+    db.add(db_reminder)
+    await db.commit()
+    await db.refresh(db_reminder)
+    read_cache.invalidate_lists("reminders")
+    logger.info(f"Created reminder for elderly ID {reminder.elderly_id}")
+    return db_reminder
+
+@router.get("/", response_model=List[ReminderListItem])
+async def read_reminders(
+    elderly_id: int = None,
+    scheduled_date: date = None,
+    sent: bool = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    dead_letter: bool = DEAD_LETTER_QUERY,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a list of reminders with optional filtering, ordered by scheduled date and ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id` and `scheduled_date`) are read;
+    without it, everything but `message` is returned.
+    Use dead_letter=true to list reminders whose delivery failed for good.
+    """
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
+
+    async def load():
+        stmt, order = list_statement(columns, elderly_id, scheduled_date, sent, include_archived, dead_letter)
+        rows = (await db.execute(paginate(stmt, order, cursor, skip, limit))).all()
+        return rows_to_content(rows), next_cursor_headers(rows, order, limit)
+
+    params = {
+        "elderly_id": elderly_id, "scheduled_date": scheduled_date, "sent": sent,
+        "skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns],
+        "include_archived": include_archived, "dead_letter": dead_letter
+    }
+    return await read_cache.response_async("reminders", params, load, response_class=ORJSONResponse, db=db)
+
+@router.get("/{reminder_id}", response_model=Reminder)
+async def read_reminder(
+    reminder_id: int,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a reminder by ID
+    """
+    async def load():
+        reminder = await db.scalar(select(ReminderModel).where(ReminderModel.id == reminder_id))
+        if not reminder and include_archived:
+            reminder = await db.scalar(select(ReminderArchive).where(ReminderArchive.id == reminder_id))
+        if not reminder:
+            raise HTTPException(status_code=404, detail="Reminder not found")
+        return jsonable_encoder(Reminder.from_orm(reminder)), {}
+
+    params = {"include_archived": include_archived}
+    return await read_cache.response_async("reminders", params, load, item_id=reminder_id, db=db)
+
+@router.put("/{reminder_id}", response_model=Reminder)
+async def update_reminder(reminder_id: int, reminder: ReminderUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Update a reminder
+    """
+    # Update fields that are provided
+    row = await db.run_sync(apply_update, reminder_id, reminder.dict(exclude_unset=True))
+    await db.commit()
+    read_cache.invalidate_item("reminders", reminder_id)
+    logger.info(f"Updated reminder ID {reminder_id}")
+    return row
+
+@router.post("/{reminder_id}/send", response_model=Reminder)
+async def send_reminder(reminder_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue a reminder by ID for delivery by the reminder worker.
+    Dead-lettered reminders are retried with a fresh set of attempts.
+    """
+    db_reminder = await _get_reminder(db, reminder_id)
+
+    if db_reminder.sent:
+        raise HTTPException(status_code=400, detail="Reminder has already been sent")
+
+    # Get the elderly person
+    elderly = await db.scalar(select(ElderlyModel).where(ElderlyModel.id == db_reminder.elderly_id))
+    if not elderly:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+
+    await db.run_sync(enqueue_reminder, db_reminder.id)
+    await db.commit()
+    await db.refresh(db_reminder)
+    # Its delivery state (attempts, dead letter) was reset
+    read_cache.invalidate_item("reminders", reminder_id)
+    logger.info(f"Queued reminder ID {reminder_id} for delivery")
+    return db_reminder
+
+@router.post("/send-due", status_code=status.HTTP_200_OK)
+async def send_due_reminders(db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue all due reminders (scheduled for today or earlier that haven't been sent)
+    for delivery by the reminder worker
+    """
+    queued = await db.run_sync(enqueue_due_reminders, date.today())
+    await db.commit()
+    # Reminder series occurrences that fell due are new reminders
+    read_cache.invalidate_lists("reminders")
+    logger.info(f"Queued {queued} due reminders for delivery")
+    return {"message": f"Queued {queued} due reminders"}
+
+@router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_reminder(reminder_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Delete a reminder
+    """
+    db_reminder = await _get_reminder(db, reminder_id)
+
+    await db.delete(db_reminder)
+    # SMS recipients reference reminders without a foreign key
+    await db.execute(delete(SmsRecipient).where(SmsRecipient.reminder_id == reminder_id))
+    await db.commit()
+    read_cache.invalidate_item("reminders", reminder_id)
+    logger.info(f"Deleted reminder ID {reminder_id}")
+    return None
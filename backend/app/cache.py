@@ -0,0 +1,241 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from dotenv import load_dotenv
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import logging
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Storage interface for the read cache.
+
+    Entries may be evicted at any time. Counters hold the generation numbers
+    used for invalidation and must never go back to a value they had before:
+    a backend shared by several workers (e.g. Redis) keeps them as plain
+    persistent keys, one that evicts them reports evicted counters as higher
+    than any value they reached.
+    """
+
+    def get(self, key: str) -> Tuple[bool, object]:
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    def counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryLRUBackend(CacheBackend):
+    """
+    Process-local backend with LRU eviction, per-entry TTL and a bounded
+    number of entries and counters.
+
+    Counters are evicted least recently used first. A missing counter reads
+    as the floor, which is kept above every evicted value, so an item whose
+    counter was evicted gets a new generation instead of an old one whose
+    entries may still be cached.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_counters: int = None):
+        self.max_entries = max_entries
+        self.max_counters = max_counters or max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._counters = OrderedDict()
+        self._counter_floor = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.counter_evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def counter(self, key):
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                return self._counter_floor
+            self._counters.move_to_end(key)
+            return value
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters.get(key, self._counter_floor) + 1
+            self._counters[key] = value
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_counters:
+                _, evicted = self._counters.popitem(last=False)
+                self._counter_floor = max(self._counter_floor, evicted + 1)
+                self.counter_evictions += 1
+            return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries), "max_entries": self.max_entries, "evictions": self.evictions,
+                "counters": len(self._counters), "max_counters": self.max_counters,
+                "counter_evictions": self.counter_evictions,
+            }
+
+
+class ReadCache:
+    """
+    Cache for GET responses with precise write-through invalidation.
+
+    Every key embeds generation counters: one per namespace, one for the
+    namespace's list results and one per item. Invalidating bumps the
+    relevant counters, so stale entries become unreachable immediately and
+    age out through LRU/TTL eviction without having to be enumerated.
+
+    That only holds for entries read after the write: a read replica may not
+    have the write yet, so reads served by a replica are never stored, and
+    clients in their sticky-to-primary window after a write skip the cache.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 30, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, namespace: str, item_id: Optional[int], params: dict) -> str:
+        ns_gen = self.backend.counter(f"{namespace}:gen")
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        if item_id is None:
+            list_gen = self.backend.counter(f"{namespace}:list:gen")
+            return f"{namespace}:{ns_gen}:list:{list_gen}:{encoded}"
+        item_gen = self.backend.counter(f"{namespace}:{item_id}:gen")
+        return f"{namespace}:{ns_gen}:item:{item_id}:{item_gen}:{encoded}"
+
+    def _lookup(self, key: str):
+        hit, entry = self.backend.get(key)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit, entry
+
+    @staticmethod
+    def _render(loaded, response_class) -> tuple:
+        """
+        Serialize a loader result once: (body bytes, headers, media type)
+        """
+        content, headers = loaded
+        return response_class(content=content).body, headers, response_class.media_type
+
+    def response(self, namespace: str, params: dict, loader: Callable, item_id: Optional[int] = None,
+                 response_class=JSONResponse, db: Session = None):
+        """
+        Return a response for the request, calling loader() on a miss.
+        loader returns (json-ready content, headers) and may raise HTTPException,
+        in which case nothing is cached. Entries hold the serialized body, so
+        hits skip serialization entirely.
+
+        db is the read session loader uses (see app.database.get_read_db):
+        sticky requests bypass the cache and replica reads are not stored.
+        """
+        info = db.info if db is not None else {}
+        if not self.enabled or info.get("sticky"):
+            entry = self._render(loader(), response_class)
+        else:
+            key = self._key(namespace, item_id, params)
+            hit, entry = self._lookup(key)
+            if not hit:
+                entry = self._render(loader(), response_class)
+                if not info.get("replica"):
+                    self.backend.set(key, entry, self.ttl)
+        body, headers, media_type = entry
+        return Response(content=body, headers=headers, media_type=media_type)
+
+    async def response_async(self, namespace: str, params: dict, loader: Callable, item_id: Optional[int] = None,
+                             response_class=JSONResponse, db: AsyncSession = None):
+        """
+        Same as response() for a coroutine loader and an async read session
+        (see app.database_async.get_async_read_db)
+        """
+        info = db.info if db is not None else {}
+        if not self.enabled or info.get("sticky"):
+            entry = self._render(await loader(), response_class)
+        else:
+            key = self._key(namespace, item_id, params)
+            hit, entry = self._lookup(key)
+            if not hit:
+                entry = self._render(await loader(), response_class)
+                if not info.get("replica"):
+                    self.backend.set(key, entry, self.ttl)
+        body, headers, media_type = entry
+        return Response(content=body, headers=headers, media_type=media_type)
+
+    def invalidate_item(self, namespace: str, item_id: int, lists: bool = True):
+        """
+        Invalidate one item and, unless lists=False, every list of its namespace
+        """
+        self.backend.incr(f"{namespace}:{item_id}:gen")
+        if lists:
+            self.backend.incr(f"{namespace}:list:gen")
+
+    def invalidate_lists(self, namespace: str):
+        self.backend.incr(f"{namespace}:list:gen")
+
+    def invalidate_namespace(self, namespace: str):
+        self.backend.incr(f"{namespace}:gen")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+# Create a singleton instance
+read_cache = ReadCache(
+    InMemoryLRUBackend(
+        max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+        max_counters=int(os.getenv("CACHE_MAX_COUNTERS", "0")) or None,
+    ),
+    ttl=float(os.getenv("CACHE_TTL_SECONDS", "30")),
+    enabled=os.getenv("CACHE_ENABLED", "True").lower() in ("1", "true", "yes"),
+)
@@ -1,8 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker, Session
+from fastapi import Request
 import os
 from dotenv import load_dotenv
+from app.db_metrics import InstrumentedQueuePool, pool_metrics
+from app.request_metrics import request_metrics
+from app.replicas import ReplicaRouter, prefers_primary
 
 # Load environment variables
 load_dotenv()
@@ -14,21 +20,140 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "elderly_care")
 
-# Database URL
-SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Database URL (DATABASE_URL overrides the individual settings, e.g. sqlite:///./elderly_care.db)
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# Connection pool settings. The defaults let every one of FastAPI's 40
+# worker threads hold a connection at peak (pool size + overflow).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() in ("1", "true", "yes")
+# Server-side statement timeout in milliseconds (PostgreSQL only, 0 disables it)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Read replicas for the read-only endpoints (comma-separated URLs; none by default)
+DB_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DB_REPLICA_URLS", os.getenv("DB_REPLICA_URL", "")).split(",") if url.strip()
+]
+DB_REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+# Replicas lagging further behind are skipped (PostgreSQL only, unset disables the check)
+DB_REPLICA_MAX_LAG_SECONDS = os.getenv("DB_REPLICA_MAX_LAG_SECONDS")
+DB_REPLICA_MAX_LAG_SECONDS = float(DB_REPLICA_MAX_LAG_SECONDS) if DB_REPLICA_MAX_LAG_SECONDS else None
+# After a write, the client's reads go to the primary for this many seconds
+DB_STICKY_PRIMARY_SECONDS = float(os.getenv("DB_STICKY_PRIMARY_SECONDS", "5"))
+
+SUPPORTED_BACKENDS = ("postgresql", "sqlite")
+
+def engine_options(url: str) -> dict:
+    """
+    Pool and connection keyword arguments for create_engine/create_async_engine.
+    Raises ValueError for databases other than PostgreSQL and SQLite, which
+    the upserts in app.updates are written for.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unsupported database {parsed.get_backend_name()}: use PostgreSQL or SQLite")
+    if parsed.get_driver_name() == "aiosqlite":
+        # aiosqlite opens a fresh connection per checkout (NullPool)
+        return {}
+
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite connections are shared across FastAPI's worker threads
+        options["connect_args"] = {"check_same_thread": False}
+    elif DB_STATEMENT_TIMEOUT_MS:
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+def enforce_foreign_keys(engine):
+    """
+    SQLite only enforces foreign keys (and their ON DELETE CASCADE) when
+    asked to on each connection
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
 # Create SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedQueuePool, **engine_options(SQLALCHEMY_DATABASE_URL)
+)
+enforce_foreign_keys(engine)
+pool_metrics.attach(engine)
+request_metrics.attach(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replica engines, each with its own pool
+replica_engines = []
+for replica_url in DB_REPLICA_URLS:
+    replica_engine = create_engine(replica_url, **engine_options(replica_url))
+    enforce_foreign_keys(replica_engine)
+    request_metrics.attach(replica_engine)
+    replica_engines.append(replica_engine)
+
+replica_router = ReplicaRouter(
+    engine, replica_engines,
+    health_check_interval=DB_REPLICA_HEALTH_CHECK_INTERVAL,
+    max_lag=DB_REPLICA_MAX_LAG_SECONDS,
+)
+
 # Create Base class
 Base = declarative_base()
 
 # Database dependency
 def get_db():
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def read_session(sticky: bool = False) -> Session:
+    """
+    Open a session for reads only: on a healthy replica, taken in turn, or
+    on the primary when sticky is set or no replica can serve it
+    """
+    if not sticky:
+        for replica in replica_router.candidates():
+            # Marked so that the read cache is not filled from a possibly lagging replica
+            db = SessionLocal(bind=replica.engine, info={"replica": True})
+            try:
+                # Connect now, so a failing replica is skipped before the handler runs
+                db.connection()
+                return db
+            except SQLAlchemyError as e:
+                db.close()
+                replica_router.mark_failed(replica, e)
+        if replica_router.replicas:
+            replica_router.primary_fallbacks += 1
+    return SessionLocal()
+
+# Database dependency for read-only endpoints
+def get_read_db(request: Request):
+    sticky = prefers_primary(request.cookies)
+    db = read_session(sticky=sticky)
+    db.info["sticky"] = sticky
     try:
         yield db
     finally:
@@ -0,0 +1,78 @@
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.database import SQLALCHEMY_DATABASE_URL, engine_options, enforce_foreign_keys, replica_router
+from app.replicas import prefers_primary
+from app.request_metrics import request_metrics
+
+# Async drivers for each supported backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """
+    Swap the sync driver of a database URL for its async counterpart
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+SQLALCHEMY_ASYNC_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Create SQLAlchemy async engine
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **engine_options(SQLALCHEMY_ASYNC_DATABASE_URL))
+enforce_foreign_keys(async_engine.sync_engine)
+request_metrics.attach(async_engine.sync_engine)
+
+# Create AsyncSessionLocal class. Objects stay usable after commit, since
+# an expired attribute cannot be lazily reloaded outside of an await.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# An async engine for each read replica. The sync replica_router still
+# decides which replicas are healthy; its checks use the sync engines.
+async_replica_engines = {}
+for replica in replica_router.replicas:
+    replica_url = async_database_url(replica.engine.url.render_as_string(hide_password=False))
+    async_replica_engines[replica] = create_async_engine(replica_url, **engine_options(replica_url))
+    enforce_foreign_keys(async_replica_engines[replica].sync_engine)
+    request_metrics.attach(async_replica_engines[replica].sync_engine)
+
+# Database dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def async_read_session(sticky: bool = False) -> AsyncSession:
+    """
+    Same as app.database.read_session for the async engines
+    """
+    if not sticky and replica_router.replicas:
+        # Health checks block, so they run off the event loop
+        for replica in await run_in_threadpool(replica_router.candidates):
+            # Marked so that the read cache is not filled from a possibly lagging replica
+            db = AsyncSessionLocal(bind=async_replica_engines[replica], info={"replica": True})
+            try:
+                # Connect now, so a failing replica is skipped before the handler runs
+                await db.connection()
+                return db
+            except SQLAlchemyError as e:
+                await db.close()
+                replica_router.mark_failed(replica, e)
+        replica_router.primary_fallbacks += 1
+    return AsyncSessionLocal()
+
+# Database dependency for read-only endpoints
+async def get_async_read_db(request: Request):
+    sticky = prefers_primary(request.cookies)
+    db = await async_read_session(sticky=sticky)
+    db.info["sticky"] = sticky
+    try:
+        yield db
+    finally:
+        await db.close()
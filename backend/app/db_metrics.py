@@ -0,0 +1,100 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from app.histogram import Histogram
+
+
+class PoolMetrics:
+    """
+    Connection pool counters and latency histograms, collected from
+    SQLAlchemy pool events and the instrumented pool class below
+    """
+
+    def __init__(self):
+        self.wait = Histogram()              # time blocked waiting for a free slot (or a new connection)
+        self.checkout_latency = Histogram()  # full checkout, including pre-ping and checkout events
+        self.hold = Histogram()              # time a connection stays checked out
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def _incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def attach(self, engine):
+        """
+        Register the pool event listeners on an engine
+        """
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self._incr("connects")
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self._incr("checkouts")
+            connection_record.info["checked_out_at"] = time.perf_counter()
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is not None:
+                self.hold.observe(time.perf_counter() - checked_out_at)
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self._incr("invalidations")
+
+    def stats(self, engine) -> dict:
+        pool = engine.pool
+        stats = {
+            "pool_class": type(pool).__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait.snapshot(),
+            "checkout_latency_seconds": self.checkout_latency.snapshot(),
+            "hold_seconds": self.hold.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        return stats
+
+
+# Create a singleton instance
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times checkouts; pool events only fire once a
+    connection has been obtained, so waiting cannot be measured from them
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics._incr("timeouts")
+            raise
+        finally:
+            pool_metrics.wait.observe(time.perf_counter() - start)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_metrics.checkout_latency.observe(time.perf_counter() - start)
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import elderly, recommendations, reminders
-from app.database import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.routes import elderly, recommendations, reminders, reminder_series, sms, analytics, metrics
+from app.pagination import NEXT_CURSOR_HEADER
+from app.request_metrics import RequestMetricsMiddleware, request_metrics, PROMETHEUS_CONTENT_TYPE
+from app.replicas import StickyPrimaryMiddleware
+from app.database import DB_REPLICA_URLS, DB_STICKY_PRIMARY_SECONDS
 import logging
 
 # Configure logging
@@ -13,33 +17,55 @@ logging.basicConfig(
     ]
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+def create_app(elderly_router, recommendations_router, reminders_router):
+    """
+    Build the API around the given resource routers, so the sync and async
+    stacks share the same configuration
+    """
+    app = FastAPI(
+        title="Elderly Care API",
+        description="API for the elderly care management application",
+        version="1.0.0"
+    )
 
-app = FastAPI(
-    title="Elderly Care API",
-    description="API for the elderly care management application",
-    version="1.0.0"
-)
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allows all origins
+        allow_credentials=True,
+        allow_methods=["*"],  # Allows all methods
+        allow_headers=["*"],  # Allows all headers
+        expose_headers=[NEXT_CURSOR_HEADER],  # Lets browsers read the pagination cursor
+    )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
-)
+    # Let clients read their own writes from the primary while replicas catch up
+    if DB_REPLICA_URLS:
+        app.add_middleware(StickyPrimaryMiddleware, window=DB_STICKY_PRIMARY_SECONDS)
+
+    # Record per-route latency and DB usage for /metrics
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
+    # Include routers
+    app.include_router(elderly_router, prefix="/api/elderly", tags=["elderly"])
+    app.include_router(recommendations_router, prefix="/api/recommendations", tags=["recommendations"])
+    app.include_router(reminders_router, prefix="/api/reminders", tags=["reminders"])
+    app.include_router(reminder_series.router, prefix="/api/reminder-series", tags=["reminder series"])
+    app.include_router(sms.router, prefix="/api/sms", tags=["sms"])
+    app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+    app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to the Elderly Care API!"}
+
+    @app.get("/api/health")
+    async def health_check():
+        return {"status": "healthy"}
 
-# Include routers
-app.include_router(elderly.router, prefix="/api/elderly", tags=["elderly"])
-app.include_router(recommendations.router, prefix="/api/recommendations", tags=["recommendations"])
-app.include_router(reminders.router, prefix="/api/reminders", tags=["reminders"])
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return PlainTextResponse(request_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
-@app.get("/")
-async def root():
-    return {"message": "Welcome to the Elderly Care API!"}
+    return app
 
-@app.get("/api/health")
-async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+app = create_app(elderly.router, recommendations.router, reminders.router)
@@ -0,0 +1,6 @@
+from app.main import create_app
+from app.async_routes import elderly, recommendations, reminders
+
+# Same API as app.main, served by async handlers on the async engine.
+# Run with: uvicorn app.main_async:app
+app = create_app(elderly.router, recommendations.router, reminders.router)
@@ -1,3 +1,6 @@
 from app.models.elderly import Elderly, RiskLevel
 from app.models.recommendation import Recommendation, Category, Adherence
-from app.models.reminder import Reminder 
\ No newline at end of file
+from app.models.reminder import Reminder, ReminderArchive
+from app.models.reminder_series import ReminderSeries
+from app.models.adherence_summary import AdherenceSummary
+from app.models.sms_recipient import SmsRecipient, SmsStatus 
\ No newline at end of file
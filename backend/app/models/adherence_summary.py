@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Enum
+from app.database import Base
+from app.models.elderly import RiskLevel
+from app.models.recommendation import Category
+
+# Bucket for recommendations whose adherence has not been recorded yet
+PENDING = "pending"
+
+class AdherenceSummary(Base):
+    """
+    Recommendation counts per (week, category, risk level, adherence),
+    kept up to date incrementally by the recommendation and elderly routes
+    """
+    __tablename__ = "adherence_summary"
+
+    week = Column(Integer, primary_key=True)
+    category = Column(Enum(Category), primary_key=True)
+    risk_level = Column(Enum(RiskLevel), primary_key=True)
+    adherence = Column(String(10), primary_key=True)  # full, partial, none or pending
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AdherenceSummary week {self.week} {self.category} {self.risk_level} {self.adherence}: {self.count}>"
@@ -1,10 +1,11 @@
 from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
 import enum
 from datetime import datetime
 
-class RiskLevel(enum.Enum):
+class RiskLevel(str, enum.Enum):
     baixo = "baixo"
     medio = "medio"
     alto = "alto"
@@ -16,18 +17,25 @@ class Elderly(Base):
     name = Column(String(255), nullable=False)
     age = Column(Integer, nullable=False)
     current_week = Column(Integer, default=1)
-    start_date = Column(Date, default=datetime.now().date())
+    start_date = Column(Date, default=lambda: datetime.now().date())
     risk_level = Column(Enum(RiskLevel), default=RiskLevel.baixo)
     phone = Column(String(20))
     caregiver_phone = Column(String(20))
     responsible_person = Column(String(255), nullable=False)
     health_conditions = Column(Text)
     observations = Column(Text)
-    created_at = Column(Date, default=datetime.now().date())
-    updated_at = Column(Date, default=datetime.now().date(), onupdate=datetime.now().date())
+    created_at = Column(Date, server_default=func.current_date())
+    updated_at = Column(Date, server_default=func.current_date(), onupdate=func.current_date())
 
-    # Relationships
-    recommendations = relationship("Recommendation", back_populates="elderly", cascade="all, delete-orphan")
+    # Relationships. Children are removed by ON DELETE CASCADE in the database
+    # (passive_deletes), instead of being loaded and deleted one by one.
+    recommendations = relationship(
+        "Recommendation", back_populates="elderly", cascade="all, delete-orphan", passive_deletes=True
+    )
+    reminders = relationship("Reminder", back_populates="elderly", cascade="all, delete-orphan", passive_deletes=True)
+    reminder_series = relationship(
+        "ReminderSeries", back_populates="elderly", cascade="all, delete-orphan", passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<Elderly {self.name}>" 
\ No newline at end of file
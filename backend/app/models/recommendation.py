@@ -1,16 +1,17 @@
-from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
 import enum
 from datetime import datetime
 
-class Category(enum.Enum):
+class Category(str, enum.Enum):
     exercicio = "exercicio"
     alimentacao = "alimentacao"
     medicacao = "medicacao"
     social = "social"
 
-class Adherence(enum.Enum):
+class Adherence(str, enum.Enum):
     full = "full"
     partial = "partial"
     none = "none"
@@ -19,17 +20,24 @@ class Recommendation(Base):
     __tablename__ = "recommendations"
 
     id = Column(Integer, primary_key=True, index=True)
-    elderly_id = Column(Integer, ForeignKey("elderly.id"), nullable=False)
+    elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False)
     week = Column(Integer, nullable=False)
-    date = Column(Date, default=datetime.now().date())
+    date = Column(Date, default=lambda: datetime.now().date())
     category = Column(Enum(Category), nullable=False)
     content = Column(Text, nullable=False)
     adherence = Column(Enum(Adherence))
-    created_at = Column(Date, default=datetime.now().date())
-    updated_at = Column(Date, default=datetime.now().date(), onupdate=datetime.now().date())
+    created_at = Column(Date, server_default=func.current_date())
+    updated_at = Column(Date, server_default=func.current_date(), onupdate=func.current_date())
 
     # Relationships
     elderly = relationship("Elderly", back_populates="recommendations")
+
+    # Indexes matching the filters and (week, id) ordering of read_recommendations
+    __table_args__ = (
+        Index("ix_recommendations_elderly_id_week", "elderly_id", "week", "id"),
+        Index("ix_recommendations_week", "week", "id"),
+        Index("ix_recommendations_category_week", "category", "week", "id"),
+    )
     
     def __repr__(self):
         return f"<Recommendation {self.id} for Elderly {self.elderly_id}>" 
\ No newline at end of file
@@ -1,24 +1,87 @@
-from sqlalchemy import Column, Integer, String, Date, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
-from datetime import datetime
 
 class Reminder(Base):
     __tablename__ = "reminders"
 
     id = Column(Integer, primary_key=True, index=True)
-    elderly_id = Column(Integer, ForeignKey("elderly.id"), nullable=False)
+    elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False)
     scheduled_date = Column(Date, nullable=False)
     email = Column(String(255), nullable=False)
     subject = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     sent = Column(Boolean, default=False)
     sent_at = Column(Date)
-    created_at = Column(Date, default=datetime.now().date())
-    updated_at = Column(Date, default=datetime.now().date(), onupdate=datetime.now().date())
+    queued_at = Column(DateTime)  # Set when the reminder is handed to the delivery worker
+    series_id = Column(Integer, ForeignKey("reminder_series.id", ondelete="SET NULL"))  # Set on series occurrences
+    # Delivery attempts (see app.services.delivery)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime)  # Set while a failed reminder waits to be retried
+    dead_lettered_at = Column(DateTime)  # Set when a reminder failed for good
+    created_at = Column(Date, server_default=func.current_date())
+    updated_at = Column(Date, server_default=func.current_date(), onupdate=func.current_date())
 
     # Relationships
-    elderly = relationship("Elderly")
+    elderly = relationship("Elderly", back_populates="reminders")
+    series = relationship("ReminderSeries", back_populates="occurrences")
+
+    # Indexes matching the filters and (scheduled_date, id) ordering of read_reminders,
+    # plus partial indexes over the small unsent part of the table used by dispatch
+    __table_args__ = (
+        # One reminder per series occurrence, however often the series is expanded
+        UniqueConstraint("series_id", "scheduled_date", name="uq_reminders_series_id_scheduled_date"),
+        Index("ix_reminders_elderly_id_scheduled_date", "elderly_id", "scheduled_date", "id"),
+        Index("ix_reminders_scheduled_date", "scheduled_date", "id"),
+        Index(
+            "ix_reminders_unsent_scheduled_date", "scheduled_date", "id",
+            postgresql_where=(sent == False), sqlite_where=(sent == False)  # noqa: E712
+        ),
+        Index(
+            "ix_reminders_queued", "queued_at", "id",
+            postgresql_where=(sent == False) & queued_at.isnot(None),  # noqa: E712
+            sqlite_where=(sent == False) & queued_at.isnot(None)  # noqa: E712
+        ),
+        Index(
+            "ix_reminders_dead_lettered", "dead_lettered_at", "id",
+            postgresql_where=dead_lettered_at.isnot(None), sqlite_where=dead_lettered_at.isnot(None)
+        ),
+        # Never reuse the IDs of deleted or archived reminders on SQLite
+        {"sqlite_autoincrement": True},
+    )
     
     def __repr__(self):
-        return f"<Reminder {self.id} for Elderly {self.elderly_id}>" 
\ No newline at end of file
+        return f"<Reminder {self.id} for Elderly {self.elderly_id}>"
+
+class ReminderArchive(Base):
+    """
+    Sent reminders moved out of the reminders table by
+    app.services.reminder_archive. Rows keep their original IDs.
+    """
+    __tablename__ = "reminders_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False)
+    scheduled_date = Column(Date, nullable=False)
+    email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    sent = Column(Boolean, nullable=False, default=True)
+    sent_at = Column(Date)
+    created_at = Column(Date)
+    updated_at = Column(Date)
+    series_id = Column(Integer)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    archived_at = Column(DateTime, server_default=func.now())
+
+    # Same orderings as the reminder list
+    __table_args__ = (
+        Index("ix_reminders_archive_elderly_id_scheduled_date", "elderly_id", "scheduled_date", "id"),
+        Index("ix_reminders_archive_scheduled_date", "scheduled_date", "id"),
+    )
+
+    def __repr__(self):
+        return f"<ReminderArchive {self.id} for Elderly {self.elderly_id}>"
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Date, Text, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ReminderSeries(Base):
+    """
+    A recurring reminder defined by an RFC 5545 recurrence rule. Occurrences
+    only become Reminder rows (with series_id set) once they are due, see
+    app.services.reminder_series.
+    """
+    __tablename__ = "reminder_series"
+
+    id = Column(Integer, primary_key=True, index=True)
+    elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False, index=True)
+    email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    rrule = Column(String(255), nullable=False)  # e.g. FREQ=WEEKLY;COUNT=16
+    dtstart = Column(Date, nullable=False)
+    active = Column(Boolean, nullable=False, default=True)
+    next_occurrence = Column(Date)  # First occurrence not materialized yet, NULL once the rule is exhausted
+    created_at = Column(Date, server_default=func.current_date())
+    updated_at = Column(Date, server_default=func.current_date(), onupdate=func.current_date())
+
+    # Relationships
+    elderly = relationship("Elderly", back_populates="reminder_series")
+    occurrences = relationship("Reminder", back_populates="series", passive_deletes=True)
+
+    # Expansion only looks at active series with an occurrence due
+    __table_args__ = (
+        Index(
+            "ix_reminder_series_next_occurrence", "next_occurrence", "id",
+            postgresql_where=(active == True), sqlite_where=(active == True)  # noqa: E712
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ReminderSeries {self.id} for Elderly {self.elderly_id}>"
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+class SmsStatus(str, enum.Enum):
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"
+
+class SmsRecipient(Base):
+    """
+    One phone number a reminder is texted to (the elderly person's or the
+    caregiver's), normalized to E.164, with its own delivery state.
+    """
+    __tablename__ = "sms_recipients"
+
+    id = Column(Integer, primary_key=True)
+    # Not a foreign key: partitioned reminders have a composite primary key,
+    # and rows outlive their reminder once it is archived
+    reminder_id = Column(Integer, nullable=False)
+    elderly_id = Column(Integer, ForeignKey("elderly.id", ondelete="CASCADE"), nullable=False)
+    phone = Column(String(20), nullable=False)
+    role = Column(String(20), nullable=False)  # elderly or caregiver
+    status = Column(Enum(SmsStatus), nullable=False, default=SmsStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    provider_id = Column(String(64))  # Message ID given by the SMS provider
+    next_attempt_at = Column(DateTime)  # Set while a failed text waits to be retried
+    sent_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        # One text per number and reminder; also the index for lookups by reminder
+        UniqueConstraint("reminder_id", "phone", name="uq_sms_recipients_reminder_id_phone"),
+        Index("ix_sms_recipients_phone", "phone", "id"),
+        # The small pending part of the table, in the order the SMS worker claims it
+        Index(
+            "ix_sms_recipients_pending", "id",
+            postgresql_where=(status == SmsStatus.pending), sqlite_where=(status == SmsStatus.pending)
+        ),
+    )
+
+    def __repr__(self):
+        return f"<SmsRecipient {self.phone} for Reminder {self.reminder_id}>"
@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor
+    """
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _cursor_value(column, value):
+    """
+    Convert one decoded cursor value to its column's Python type, or raise
+    ValueError when it cannot be one
+    """
+    python_type = column.type.python_type
+    if python_type in (date, datetime):
+        if not isinstance(value, str):
+            raise ValueError(f"{column.key} must be an ISO date")
+        return python_type.fromisoformat(value)
+    # bool is an int to Python, but not a valid integer key
+    if isinstance(value, bool) and python_type is not bool:
+        raise ValueError(f"{column.key} must be a {python_type.__name__}")
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type):
+        raise ValueError(f"{column.key} must be a {python_type.__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> tuple:
+    """
+    Decode a cursor back into sort key values typed like the given columns.
+    Raises 400 when it is malformed or its values do not fit the columns.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        return tuple(_cursor_value(column, value) for column, value in zip(columns, payload))
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, columns: Sequence, cursor: Optional[str], skip: int, limit: int):
+    """
+    Order a query by a unique sort key and page through it.
+
+    With a cursor, the page starts right after the row the cursor points at
+    (keyset pagination) and skip is ignored; without one, the classic
+    skip/limit contract applies on the same stable ordering.
+    """
+    query = query.order_by(*columns)
+    if cursor:
+        query = query.filter(tuple_(*columns) > tuple_(*decode_cursor(cursor, columns)))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor_headers(rows: list, columns: Sequence, limit: int) -> dict:
+    """
+    Response headers exposing the cursor of the next page (X-Next-Cursor)
+    when the current page is full
+    """
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        return {NEXT_CURSOR_HEADER: encode_cursor([getattr(last, c.key) for c in columns])}
+    return {}
@@ -0,0 +1,158 @@
+import itertools
+import math
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cookie telling read-only endpoints to use the primary until the given Unix time
+STICKY_PRIMARY_COOKIE = "db_primary_until"
+
+# Methods that never write, so they do not start a sticky-to-primary window
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    """
+    A read replica engine and what the last health check found
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = 0.0  # time.monotonic() of the last health check
+        self.lag_seconds = None
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """
+    Pick the engine for a read-only session: the healthy replicas in turn,
+    or the primary when there are none or none is healthy.
+
+    A replica is checked (a ping, plus its replication lag on PostgreSQL when
+    max_lag is set) at most every health_check_interval seconds, by whichever
+    request finds its last check too old. A replica that fails to give a
+    connection is marked unhealthy until its next check.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], health_check_interval: float = 5.0,
+                 max_lag: Optional[float] = None):
+        self.primary = primary
+        self.replicas = [Replica(engine) for engine in replicas]
+        self.health_check_interval = health_check_interval
+        self.max_lag = max_lag
+        self.primary_fallbacks = 0
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def check(self, replica: Replica) -> bool:
+        """
+        Ping a replica and record whether it can serve reads
+        """
+        healthy = True
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                if self.max_lag is not None and replica.engine.dialect.name == "postgresql":
+                    replica.lag_seconds = float(conn.execute(text(
+                        "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    )).scalar())
+                    healthy = replica.lag_seconds <= self.max_lag
+                    if not healthy:
+                        logger.warning(f"Read replica {replica.name} is {replica.lag_seconds:.1f} s behind the primary")
+        except SQLAlchemyError as e:
+            logger.warning(f"Read replica {replica.name} failed its health check: {str(e)}")
+            healthy = False
+
+        if healthy and not replica.healthy:
+            logger.info(f"Read replica {replica.name} is healthy again")
+        elif not healthy and replica.healthy:
+            logger.warning(f"Read replica {replica.name} taken out of rotation")
+        replica.healthy = healthy
+        return healthy
+
+    def _due_for_check(self, replica: Replica) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now - replica.checked_at < self.health_check_interval:
+                return False
+            # Claim the check so that concurrent requests skip it
+            replica.checked_at = now
+            return True
+
+    def candidates(self) -> List[Replica]:
+        """
+        Healthy replicas, starting with the one whose turn it is
+        """
+        if not self.replicas:
+            return []
+        start = next(self._turn) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        for replica in ordered:
+            if self._due_for_check(replica):
+                self.check(replica)
+        return [replica for replica in ordered if replica.healthy]
+
+    def mark_failed(self, replica: Replica, error: Exception):
+        logger.warning(f"Read replica {replica.name} failed, falling back: {str(error)}")
+        with self._lock:
+            replica.failures += 1
+            replica.healthy = False
+            replica.checked_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"url": r.name, "healthy": r.healthy, "lag_seconds": r.lag_seconds, "failures": r.failures}
+                for r in self.replicas
+            ],
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+def prefers_primary(cookies: dict) -> bool:
+    """
+    Whether the client wrote recently enough that it must read from the primary
+    """
+    try:
+        return float(cookies.get(STICKY_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class StickyPrimaryMiddleware:
+    """
+    ASGI middleware that answers every successful write with a cookie sending
+    the client's reads to the primary for the next `window` seconds, so it
+    reads its own writes despite replication lag
+    """
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{STICKY_PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from app.histogram import Histogram
+import logging
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Statements listed in a slow request log entry, slowest first
+SLOW_LOG_MAX_STATEMENTS = 20
+
+
+class RequestStats:
+    """
+    SQL statements executed while serving one request
+    """
+
+    def __init__(self):
+        self.statements = []  # (statement, seconds)
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.statements)
+
+
+# Stats of the request being served. Handlers run in copies of the
+# middleware's context, so they all see and fill the same object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """
+    Per-route latency, DB query count and DB time histograms, rendered
+    in the Prometheus text exposition format
+    """
+
+    def __init__(self, slow_request_threshold: float = 0.5):
+        self.slow_request_threshold = slow_request_threshold
+        self.latency = {}     # (method, route, status) -> Histogram
+        self.db_queries = {}  # (method, route) -> Histogram
+        self.db_time = {}     # (method, route) -> Histogram
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """
+        Time every statement an engine executes on behalf of a request
+        """
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if current_request.get() is not None:
+                conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            stats = current_request.get()
+            if stats is not None and conn.info.get("query_start"):
+                stats.statements.append((statement, time.perf_counter() - conn.info["query_start"].pop()))
+
+    def _histogram(self, series: dict, key: tuple, buckets=None) -> Histogram:
+        histogram = series.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = series.setdefault(key, Histogram(buckets) if buckets else Histogram())
+        return histogram
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        self._histogram(self.latency, (method, route, str(status))).observe(seconds)
+        self._histogram(self.db_queries, (method, route), QUERY_COUNT_BUCKETS).observe(stats.query_count)
+        self._histogram(self.db_time, (method, route)).observe(stats.db_seconds)
+
+        if seconds >= self.slow_request_threshold:
+            slowest = sorted(stats.statements, key=lambda s: s[1], reverse=True)[:SLOW_LOG_MAX_STATEMENTS]
+            listing = "".join(f"\n  {duration * 1000:.1f} ms: {statement}" for statement, duration in slowest)
+            logger.warning(
+                f"Slow request: {method} {route} -> {status} took {seconds * 1000:.1f} ms "
+                f"({stats.query_count} queries, {stats.db_seconds * 1000:.1f} ms in DB){listing}"
+            )
+
+    def render(self) -> str:
+        """
+        Render every series in the Prometheus text format
+        """
+        lines = []
+        families = (
+            ("http_request_duration_seconds", "Request latency by route template and status code",
+             self.latency, ("method", "route", "status")),
+            ("http_request_db_queries", "SQL statements executed per request",
+             self.db_queries, ("method", "route")),
+            ("http_request_db_seconds", "Time spent executing SQL per request",
+             self.db_time, ("method", "route")),
+        )
+        for name, help_text, series, label_names in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            with self._lock:
+                items = sorted(series.items())
+            for key, histogram in items:
+                labels = dict(zip(label_names, key))
+                snapshot = histogram.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+                lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+                lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request under its route template
+    (e.g. /api/elderly/{elderly_id}) so that series stay bounded
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            self.metrics.observe(scope["method"], route_path, status_code, time.perf_counter() - start, stats)
+
+
+# Create a singleton instance
+request_metrics = RequestMetrics(
+    slow_request_threshold=float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500")) / 1000,
+)
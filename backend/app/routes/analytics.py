@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from typing import List
+from app.database import get_read_db
+from app.models import AdherenceSummary
+from app.schemas import AdherenceGroup, AdherenceGroupByEnum, CategoryEnum, RiskLevelEnum
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+ADHERENCE_BUCKETS = ("full", "partial", "none", "pending")
+
+@router.get("/adherence", response_model=List[AdherenceGroup])
+def read_adherence_analytics(
+    group_by: List[AdherenceGroupByEnum] = Query(list(AdherenceGroupByEnum)),
+    week_from: int = Query(None, ge=1, le=16),
+    week_to: int = Query(None, ge=1, le=16),
+    category: CategoryEnum = None,
+    risk_level: RiskLevelEnum = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get recommendation adherence counts and rates grouped by week, category
+    and/or risk level. Served from the adherence summary table, so the cost
+    does not grow with the number of recommendations.
+    """
+    group_columns = [getattr(AdherenceSummary, field.value) for field in dict.fromkeys(group_by)]
+    stmt = select(*group_columns, AdherenceSummary.adherence, func.sum(AdherenceSummary.count))
+    
+    # Apply filters if provided
+    if week_from:
+        stmt = stmt.where(AdherenceSummary.week >= week_from)
+    if week_to:
+        stmt = stmt.where(AdherenceSummary.week <= week_to)
+    if category:
+        stmt = stmt.where(AdherenceSummary.category == category)
+    if risk_level:
+        stmt = stmt.where(AdherenceSummary.risk_level == risk_level)
+    
+    stmt = stmt.group_by(*group_columns, AdherenceSummary.adherence).order_by(*group_columns)
+    
+    # Pivot the adherence buckets of each group into one entry
+    groups = {}
+    for row in db.execute(stmt):
+        key = tuple(row[:len(group_columns)])
+        counts = groups.setdefault(key, dict.fromkeys(ADHERENCE_BUCKETS, 0))
+        counts[row[-2]] += row[-1] or 0
+    
+    result = []
+    for key, counts in groups.items():
+        recorded = counts["full"] + counts["partial"] + counts["none"]
+        group = AdherenceGroup(
+            **{column.key: value for column, value in zip(group_columns, key)},
+            total=recorded + counts["pending"],
+            **counts,
+            full_rate=counts["full"] / recorded if recorded else None,
+            partial_rate=counts["partial"] / recorded if recorded else None,
+            none_rate=counts["none"] / recorded if recorded else None
+        )
+        if group.total:
+            result.append(group)
+    return result
@@ -1,14 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import Elderly as ElderlyModel
-from app.schemas import ElderlyCreate, Elderly, ElderlyUpdate, ElderlyWithRecommendations
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.serialization import schema_columns, rows_to_content, select_fields
+from app.updates import update_returning
+from app.services import adherence_summary
+from app.models import Elderly as ElderlyModel, Recommendation as RecommendationModel
+from app.schemas import ElderlyCreate, Elderly, ElderlyUpdate, ElderlyWithRecommendations, ElderlyListItem
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Unique sort key used for stable ordering and cursor pagination
+LIST_ORDER = (ElderlyModel.id,)
+
+# List responses are built from plain column rows instead of ORM objects
+LIST_COLUMNS = schema_columns(ElderlyModel, Elderly)
+# Unbounded text left out of lists unless requested with fields=
+LIST_DEFERRED = ("health_conditions", "observations")
+FIELDS_QUERY = Query(
+    None, description="Comma-separated fields to return; health_conditions and observations are omitted by default"
+)
+
+def apply_update(db: Session, elderly_id: int, changes: dict) -> dict:
+    """
+    Update an elderly person with a single UPDATE ... RETURNING (that also
+    reads the old risk level on PostgreSQL, see update_returning), moving
+    their recommendations between adherence summary buckets when the risk
+    level changes. Raises 404 when they do not exist.
+    """
+    previous = (ElderlyModel.risk_level,) if "risk_level" in changes else ()
+    row = update_returning(db, ElderlyModel.__table__, elderly_id, changes, returning=LIST_COLUMNS, previous=previous)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+    
+    if previous:
+        adherence_summary.record_risk_level_changed(db, elderly_id, row["old_risk_level"], row["risk_level"])
+    return row
+
 @router.post("/", response_model=Elderly, status_code=status.HTTP_201_CREATED)
 def create_elderly(elderly: ElderlyCreate, db: Session = Depends(get_db)):
     """
@@ -29,55 +65,99 @@ def create_elderly(elderly: ElderlyCreate, db: Session = Depends(get_db)):
     db.add(db_elderly)
     db.commit()
     db.refresh(db_elderly)
+    read_cache.invalidate_lists("elderly")
     logger.info(f"Created elderly person: {db_elderly.name}")
     return db_elderly
 
-@router.get("/", response_model=List[Elderly])
-def read_elderly_list(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=List[ElderlyListItem])
+def read_elderly_list(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_read_db)
+):
     """
-    Get a list of elderly people
+    Get a list of elderly people ordered by ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id`) are read; without it, everything
+    but the long free-text fields is returned.
     """
-    elderly_list = db.query(ElderlyModel).offset(skip).limit(limit).all()
-    return elderly_list
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
+    
+    def load():
+        rows = db.execute(paginate(select(*columns), LIST_ORDER, cursor, skip, limit)).all()
+        return rows_to_content(rows), next_cursor_headers(rows, LIST_ORDER, limit)
+    
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns]}
+    return read_cache.response("elderly", params, load, response_class=ORJSONResponse, db=db)
 
 @router.get("/{elderly_id}", response_model=ElderlyWithRecommendations)
-def read_elderly(elderly_id: int, db: Session = Depends(get_db)):
+def read_elderly(
+    elderly_id: int,
+    include_recommendations: bool = True,
+    recommendations_limit: int = Query(20, ge=1, le=500),
+    recommendations_week: Optional[int] = Query(None, ge=1, le=16),
+    db: Session = Depends(get_read_db)
+):
     """
-    Get an elderly person by ID with their recommendations
+    Get an elderly person by ID with their latest recommendations (newest first).
+    Use recommendations_week to embed a single week instead, or
+    include_recommendations=false to skip them altogether.
     """
-    elderly = db.query(ElderlyModel).filter(ElderlyModel.id == elderly_id).first()
-    if not elderly:
-        raise HTTPException(status_code=404, detail="Elderly person not found")
-    return elderly
+    def load():
+        elderly = db.query(ElderlyModel).filter(ElderlyModel.id == elderly_id).first()
+        if not elderly:
+            raise HTTPException(status_code=404, detail="Elderly person not found")
+        
+        # Load a capped page of recommendations with one query instead of lazily
+        # loading the whole relationship
+        recommendations = []
+        if include_recommendations:
+            query = db.query(RecommendationModel).filter(RecommendationModel.elderly_id == elderly_id)
+            if recommendations_week:
+                query = query.filter(RecommendationModel.week == recommendations_week)
+            recommendations = query.order_by(
+                RecommendationModel.week.desc(), RecommendationModel.id.desc()
+            ).limit(recommendations_limit).all()
+        set_committed_value(elderly, "recommendations", recommendations)
+        return jsonable_encoder(ElderlyWithRecommendations.from_orm(elderly)), {}
+    
+    params = {
+        "include_recommendations": include_recommendations,
+        "recommendations_limit": recommendations_limit,
+        "recommendations_week": recommendations_week
+    }
+    return read_cache.response("elderly", params, load, item_id=elderly_id, db=db)
 
 @router.put("/{elderly_id}", response_model=Elderly)
 def update_elderly(elderly_id: int, elderly: ElderlyUpdate, db: Session = Depends(get_db)):
     """
     Update an elderly person
     """
-    db_elderly = db.query(ElderlyModel).filter(ElderlyModel.id == elderly_id).first()
-    if not db_elderly:
-        raise HTTPException(status_code=404, detail="Elderly person not found")
-    
     # Update fields that are provided
-    for field, value in elderly.dict(exclude_unset=True).items():
-        setattr(db_elderly, field, value)
-    
+    row = apply_update(db, elderly_id, elderly.dict(exclude_unset=True))
     db.commit()
-    db.refresh(db_elderly)
-    logger.info(f"Updated elderly person: {db_elderly.name}")
-    return db_elderly
+    read_cache.invalidate_item("elderly", elderly_id)
+    logger.info(f"Updated elderly person: {row['name']}")
+    return row
 
 @router.delete("/{elderly_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_elderly(elderly_id: int, db: Session = Depends(get_db)):
     """
     Delete an elderly person
     """
-    db_elderly = db.query(ElderlyModel).filter(ElderlyModel.id == elderly_id).first()
+    # Locked, so that their risk level and recommendations cannot change before they are gone
+    db_elderly = db.query(ElderlyModel).filter(ElderlyModel.id == elderly_id).with_for_update().first()
     if not db_elderly:
         raise HTTPException(status_code=404, detail="Elderly person not found")
     
+    adherence_summary.record_elderly_deleted(db, elderly_id, db_elderly.risk_level)
     db.delete(db_elderly)
     db.commit()
+    read_cache.invalidate_item("elderly", elderly_id)
+    # Their recommendations and reminders are gone too
+    read_cache.invalidate_namespace("recommendations")
+    read_cache.invalidate_namespace("reminders")
     logger.info(f"Deleted elderly person with ID: {elderly_id}")
     return None 
\ No newline at end of file
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from app.cache import read_cache
+from app.database import engine, replica_router
+from app.db_metrics import pool_metrics
+
+router = APIRouter()
+
+@router.get("/cache")
+def read_cache_metrics():
+    """
+    Get read cache hit/miss counters and occupancy
+    """
+    return read_cache.stats()
+
+@router.get("/db")
+def read_db_metrics():
+    """
+    Get connection pool occupancy, wait/checkout/hold latency histograms and counters,
+    and the health of the read replicas. Pool figures are for this process's
+    primary engine only: the read replica pools and the async app's pool
+    (app.main_async) are not included.
+    """
+    return {**pool_metrics.stats(engine), **replica_router.stats()}
@@ -1,22 +1,119 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy import select, insert, delete
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.replicas import prefers_primary
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.serialization import schema_columns, rows_to_content, select_fields
+from app.updates import update_returning
 from app.models import Recommendation as RecommendationModel, Elderly as ElderlyModel
 from app.schemas import RecommendationCreate, Recommendation, RecommendationUpdate, RecommendationAdherenceUpdate
+from app.schemas import RecommendationBulkCreate, RecommendationBulkResult, BulkItemError, ExportFormatEnum, RecommendationListItem
+from app.services.recommendation_export import export_statement, stream_export
+from app.services import adherence_summary
 import logging
 from datetime import date
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Unique sort key used for stable ordering and cursor pagination
+LIST_ORDER = (RecommendationModel.week, RecommendationModel.id)
+
+# List responses are built from plain column rows instead of ORM objects
+LIST_COLUMNS = schema_columns(RecommendationModel, Recommendation)
+# Unbounded text left out of lists unless requested with fields=
+LIST_DEFERRED = ("content",)
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return; content is omitted by default")
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.csv: "text/csv",
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+}
+
+def filter_recommendations(query, elderly_id: int = None, week: int = None, category: str = None):
+    """
+    Apply the optional list filters to a recommendations query or select
+    """
+    if elderly_id:
+        query = query.filter(RecommendationModel.elderly_id == elderly_id)
+    if week:
+        query = query.filter(RecommendationModel.week == week)
+    if category:
+        query = query.filter(RecommendationModel.category == category)
+    return query
+
+def _summary_key(db_recommendation, risk_level):
+    return adherence_summary.summary_key(
+        db_recommendation.week, db_recommendation.category, risk_level, db_recommendation.adherence
+    )
+
+def _invalidate_recommendation(recommendation_id: int, elderly_id: int):
+    read_cache.invalidate_item("recommendations", recommendation_id)
+    read_cache.invalidate_item("elderly", elderly_id, lists=False)
+
+# Summary key parts read alongside an update: the recommendation's values from before the update
+SUMMARY_PREVIOUS = (RecommendationModel.week, RecommendationModel.category, RecommendationModel.adherence)
+
+def apply_update(db: Session, recommendation_id: int, changes: dict) -> dict:
+    """
+    Update a recommendation and move it between adherence summary buckets.
+    On PostgreSQL the update, its previous values and the elderly person's
+    risk level (locked like adherence_summary.risk_level_of) come from a
+    single statement. Raises 404 when it does not exist.
+    """
+    row = update_returning(
+        db, RecommendationModel.__table__, recommendation_id, changes,
+        returning=LIST_COLUMNS, previous=SUMMARY_PREVIOUS,
+        shared=(ElderlyModel.risk_level,), onclause=ElderlyModel.id == RecommendationModel.elderly_id
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Recommendation not found")
+    
+    adherence_summary.record_changed(
+        db,
+        adherence_summary.summary_key(row["old_week"], row["old_category"], row["risk_level"], row["old_adherence"]),
+        adherence_summary.summary_key(row["week"], row["category"], row["risk_level"], row["adherence"])
+    )
+    return row
+
+def delete_row(db: Session, recommendation_id: int) -> int:
+    """
+    Delete a recommendation with a single DELETE ... RETURNING and take it
+    out of the adherence summary. The summary key comes from the deleted
+    row, so of concurrent deletes only the one that removed it counts it.
+    Returns the elderly ID; raises 404 when it does not exist.
+    """
+    elderly = adherence_summary.recommendation_risk_level(db, recommendation_id)
+    row = db.execute(
+        delete(RecommendationModel)
+        .where(RecommendationModel.id == recommendation_id)
+        .returning(*SUMMARY_PREVIOUS)
+    ).first() if elderly else None
+    if row is None:
+        raise HTTPException(status_code=404, detail="Recommendation not found")
+    
+    adherence_summary.record_deleted(
+        db, [adherence_summary.summary_key(row.week, row.category, elderly.risk_level, row.adherence)]
+    )
+    return elderly.elderly_id
+
 @router.post("/", response_model=Recommendation, status_code=status.HTTP_201_CREATED)
 def create_recommendation(recommendation: RecommendationCreate, db: Session = Depends(get_db)):
     """
     Create a new recommendation for an elderly person
     """
-    # Check if elderly exists
-    elderly = db.query(ElderlyModel).filter(ElderlyModel.id == recommendation.elderly_id).first()
+    # Check if elderly exists, locking their risk level until the summary is updated
+    elderly = (
+        db.query(ElderlyModel)
+        .filter(ElderlyModel.id == recommendation.elderly_id)
+        .with_for_update(read=True)
+        .first()
+    )
     if not elderly:
         raise HTTPException(status_code=404, detail="Elderly person not found")
     
@@ -30,63 +127,144 @@ def create_recommendation(recommendation: RecommendationCreate, db: Session = De
         adherence=recommendation.adherence
     )
     db.add(db_recommendation)
+    adherence_summary.record_created(db, [_summary_key(db_recommendation, elderly.risk_level)])
     db.commit()
     db.refresh(db_recommendation)
+    read_cache.invalidate_lists("recommendations")
+    # The elderly profile embeds their latest recommendations
+    read_cache.invalidate_item("elderly", recommendation.elderly_id, lists=False)
     logger.info(f"Created recommendation for elderly ID {recommendation.elderly_id}")
     return db_recommendation
 
-@router.get("/", response_model=List[Recommendation])
+@router.post("/bulk", response_model=RecommendationBulkResult, status_code=status.HTTP_201_CREATED)
+def create_recommendations_bulk(bulk: RecommendationBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create many recommendations at once (up to 10,000 items).
+    Items for unknown elderly people are reported in `errors` by their index;
+    every other item is created.
+    """
+    # Validate every elderly ID with one query
+    requested_ids = {item.elderly_id for item in bulk.items}
+    risk_levels = dict(db.execute(
+        select(ElderlyModel.id, ElderlyModel.risk_level)
+        .where(ElderlyModel.id.in_(requested_ids))
+        .with_for_update(read=True)
+    ).all())
+    
+    rows = []
+    errors = []
+    today = date.today()
+    for index, item in enumerate(bulk.items):
+        if item.elderly_id not in risk_levels:
+            errors.append(BulkItemError(index=index, elderly_id=item.elderly_id, detail="Elderly person not found"))
+            continue
+        rows.append({
+            "elderly_id": item.elderly_id,
+            "week": item.week,
+            "date": item.date or today,
+            "category": item.category,
+            "content": item.content,
+            "adherence": item.adherence
+        })
+    
+    # Multi-row INSERT ... RETURNING instead of one round trip per row
+    created = []
+    if rows:
+        inserted = db.scalars(insert(RecommendationModel).returning(RecommendationModel), rows)
+        # Serialize before commit expires the returned objects
+        created = [Recommendation.from_orm(row) for row in inserted]
+        adherence_summary.record_created(db, [
+            adherence_summary.summary_key(row["week"], row["category"], risk_levels[row["elderly_id"]], row["adherence"])
+            for row in rows
+        ])
+        db.commit()
+        read_cache.invalidate_lists("recommendations")
+        for elderly_id in {row["elderly_id"] for row in rows}:
+            read_cache.invalidate_item("elderly", elderly_id, lists=False)
+    logger.info(f"Bulk created {len(created)} recommendations ({len(errors)} rejected)")
+    return RecommendationBulkResult(created=created, errors=errors)
+
+@router.get("/", response_model=List[RecommendationListItem])
 def read_recommendations(
     elderly_id: int = None, 
     week: int = None,
     category: str = None,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get a list of recommendations with optional filtering
+    Get a list of recommendations with optional filtering, ordered by week and ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id` and `week`) are read; without it,
+    everything but `content` is returned.
     """
-    query = db.query(RecommendationModel)
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
     
-    # Apply filters if provided
-    if elderly_id:
-        query = query.filter(RecommendationModel.elderly_id == elderly_id)
-    if week:
-        query = query.filter(RecommendationModel.week == week)
-    if category:
-        query = query.filter(RecommendationModel.category == category)
+    def load():
+        stmt = filter_recommendations(select(*columns), elderly_id, week, category)
+        rows = db.execute(paginate(stmt, LIST_ORDER, cursor, skip, limit)).all()
+        return rows_to_content(rows), next_cursor_headers(rows, LIST_ORDER, limit)
     
-    recommendations = query.offset(skip).limit(limit).all()
-    return recommendations
+    params = {
+        "elderly_id": elderly_id, "week": week, "category": category,
+        "skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns]
+    }
+    return read_cache.response("recommendations", params, load, response_class=ORJSONResponse, db=db)
+
+@router.get("/export")
+def export_recommendations(
+    request: Request,
+    format: ExportFormatEnum = ExportFormatEnum.csv,
+    elderly_id: int = None,
+    week: int = None,
+    category: str = None,
+    date_from: date = None,
+    date_to: date = None
+):
+    """
+    Stream recommendations joined with their elderly person as CSV or NDJSON.
+    Accepts the same filters as the list endpoint plus an inclusive date range.
+    """
+    stmt = filter_recommendations(export_statement(), elderly_id, week, category)
+    if date_from:
+        stmt = stmt.where(RecommendationModel.date >= date_from)
+    if date_to:
+        stmt = stmt.where(RecommendationModel.date <= date_to)
+    
+    filename = f"recommendations.{format.value}"
+    return StreamingResponse(
+        stream_export(stmt, format.value, sticky=prefers_primary(request.cookies)),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/{recommendation_id}", response_model=Recommendation)
-def read_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
+def read_recommendation(recommendation_id: int, db: Session = Depends(get_read_db)):
     """
     Get a recommendation by ID
     """
-    recommendation = db.query(RecommendationModel).filter(RecommendationModel.id == recommendation_id).first()
-    if not recommendation:
-        raise HTTPException(status_code=404, detail="Recommendation not found")
-    return recommendation
+    def load():
+        recommendation = db.query(RecommendationModel).filter(RecommendationModel.id == recommendation_id).first()
+        if not recommendation:
+            raise HTTPException(status_code=404, detail="Recommendation not found")
+        return jsonable_encoder(Recommendation.from_orm(recommendation)), {}
+    
+    return read_cache.response("recommendations", {}, load, item_id=recommendation_id, db=db)
 
 @router.put("/{recommendation_id}", response_model=Recommendation)
 def update_recommendation(recommendation_id: int, recommendation: RecommendationUpdate, db: Session = Depends(get_db)):
     """
     Update a recommendation
     """
-    db_recommendation = db.query(RecommendationModel).filter(RecommendationModel.id == recommendation_id).first()
-    if not db_recommendation:
-        raise HTTPException(status_code=404, detail="Recommendation not found")
-    
     # Update fields that are provided
-    for field, value in recommendation.dict(exclude_unset=True).items():
-        setattr(db_recommendation, field, value)
-    
+    row = apply_update(db, recommendation_id, recommendation.dict(exclude_unset=True))
     db.commit()
-    db.refresh(db_recommendation)
+    _invalidate_recommendation(recommendation_id, row["elderly_id"])
     logger.info(f"Updated recommendation ID {recommendation_id}")
-    return db_recommendation
+    return row
 
 @router.patch("/{recommendation_id}/adherence", response_model=Recommendation)
 def update_recommendation_adherence(
@@ -97,26 +275,19 @@ def update_recommendation_adherence(
     """
     Update only the adherence status of a recommendation
     """
-    db_recommendation = db.query(RecommendationModel).filter(RecommendationModel.id == recommendation_id).first()
-    if not db_recommendation:
-        raise HTTPException(status_code=404, detail="Recommendation not found")
-    
-    db_recommendation.adherence = adherence_update.adherence
+    row = apply_update(db, recommendation_id, {"adherence": adherence_update.adherence})
     db.commit()
-    db.refresh(db_recommendation)
+    _invalidate_recommendation(recommendation_id, row["elderly_id"])
     logger.info(f"Updated adherence for recommendation ID {recommendation_id} to {adherence_update.adherence}")
-    return db_recommendation
+    return row
 
 @router.delete("/{recommendation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_recommendation(recommendation_id: int, db: Session = Depends(get_db)):
     """
     Delete a recommendation
     """
-    db_recommendation = db.query(RecommendationModel).filter(RecommendationModel.id == recommendation_id).first()
-    if not db_recommendation:
-        raise HTTPException(status_code=404, detail="Recommendation not found")
-    
-    db.delete(db_recommendation)
+    elderly_id = delete_row(db, recommendation_id)
     db.commit()
+    _invalidate_recommendation(recommendation_id, elderly_id)
     logger.info(f"Deleted recommendation ID {recommendation_id}")
     return None 
\ No newline at end of file
@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.serialization import schema_columns, rows_to_content
+from app.models import ReminderSeries as ReminderSeriesModel, Reminder as ReminderModel, ReminderArchive
+from app.models import Elderly as ElderlyModel
+from app.schemas import ReminderSeries, ReminderSeriesCreate, ReminderSeriesUpdate, ReminderOccurrence
+from app.services.reminder_series import occurrences, first_occurrence, apply_series_update, pending_occurrences
+import logging
+from datetime import date, timedelta
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Unique sort key used for stable ordering and cursor pagination
+LIST_ORDER = (ReminderSeriesModel.id,)
+
+# List responses are built from plain column rows instead of ORM objects
+LIST_COLUMNS = schema_columns(ReminderSeriesModel, ReminderSeries)
+
+# Longest date range the occurrences endpoint expands at once
+MAX_OCCURRENCE_RANGE = timedelta(days=366)
+
+def _get_series(db: Session, series_id: int) -> ReminderSeriesModel:
+    series = db.query(ReminderSeriesModel).filter(ReminderSeriesModel.id == series_id).first()
+    if not series:
+        raise HTTPException(status_code=404, detail="Reminder series not found")
+    return series
+
+@router.post("/", response_model=ReminderSeries, status_code=status.HTTP_201_CREATED)
+def create_reminder_series(series: ReminderSeriesCreate, db: Session = Depends(get_db)):
+    """
+    Create a recurring reminder for an elderly person. Its occurrences
+    become reminders as they fall due (see /api/reminders/send-due), from
+    today on: occurrences before today are not sent.
+    """
+    # Check if elderly exists
+    elderly = db.query(ElderlyModel).filter(ElderlyModel.id == series.elderly_id).first()
+    if not elderly:
+        raise HTTPException(status_code=404, detail="Elderly person not found")
+    
+    db_series = ReminderSeriesModel(
+        **series.dict(),
+        active=True,
+        next_occurrence=first_occurrence(series.rrule, series.dtstart, max(date.today(), series.dtstart))
+    )
+    db.add(db_series)
+    db.commit()
+    db.refresh(db_series)
+    logger.info(f"Created reminder series {db_series.id} for elderly ID {series.elderly_id}")
+    return db_series
+
+@router.get("/", response_model=List[ReminderSeries])
+def read_reminder_series_list(
+    elderly_id: int = None,
+    active: bool = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a list of reminder series with optional filtering, ordered by ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    """
+    query = select(*LIST_COLUMNS)
+    
+    # Apply filters if provided
+    if elderly_id:
+        query = query.where(ReminderSeriesModel.elderly_id == elderly_id)
+    if active is not None:
+        query = query.where(ReminderSeriesModel.active == active)
+    
+    rows = db.execute(paginate(query, LIST_ORDER, cursor, skip, limit)).all()
+    return ORJSONResponse(rows_to_content(rows), headers=next_cursor_headers(rows, LIST_ORDER, limit))
+
+@router.get("/{series_id}", response_model=ReminderSeries)
+def read_reminder_series(series_id: int, db: Session = Depends(get_read_db)):
+    """
+    Get a reminder series by ID
+    """
+    return _get_series(db, series_id)
+
+@router.get("/{series_id}/occurrences", response_model=List[ReminderOccurrence])
+def read_reminder_series_occurrences(
+    series_id: int,
+    date_from: date = None,
+    date_to: date = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the occurrences of a series between two dates (by default the year
+    from its start), with the delivery state of the ones already due.
+    Future occurrences are computed from the rule, not stored.
+    """
+    series = _get_series(db, series_id)
+    date_from = date_from or series.dtstart
+    date_to = date_to or date_from + MAX_OCCURRENCE_RANGE
+    if date_to < date_from or date_to - date_from > MAX_OCCURRENCE_RANGE:
+        raise HTTPException(status_code=400, detail="date_to must be within a year after date_from")
+    
+    # Materialized occurrences, including archived ones and any left from an earlier schedule
+    materialized = {}
+    for table in (ReminderModel.__table__, ReminderArchive.__table__):
+        rows = db.execute(
+            select(table.c.id, table.c.scheduled_date, table.c.sent, table.c.sent_at)
+            .where(table.c.series_id == series_id, table.c.scheduled_date.between(date_from, date_to))
+        )
+        for row in rows:
+            materialized[row.scheduled_date] = row
+    
+    days = sorted(set(occurrences(series.rrule, series.dtstart, date_from, date_to)) | set(materialized))
+    result = []
+    for day in days:
+        row = materialized.get(day)
+        if row is None:
+            result.append(ReminderOccurrence(scheduled_date=day))
+        else:
+            result.append(ReminderOccurrence(scheduled_date=day, reminder_id=row.id, sent=bool(row.sent), sent_at=row.sent_at))
+    return result
+
+@router.put("/{series_id}", response_model=ReminderSeries)
+def update_reminder_series(series_id: int, series: ReminderSeriesUpdate, db: Session = Depends(get_db)):
+    """
+    Update a reminder series. Content changes also apply to its occurrences
+    that are due but not sent yet; a new schedule applies from today on.
+    """
+    db_series = _get_series(db, series_id)
+    affected = apply_series_update(db, db_series, series.dict(exclude_unset=True))
+    db.commit()
+    db.refresh(db_series)
+    if affected:
+        read_cache.invalidate_namespace("reminders")
+    logger.info(f"Updated reminder series {series_id} ({affected} pending occurrences changed)")
+    return db_series
+
+@router.delete("/{series_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_reminder_series(series_id: int, db: Session = Depends(get_db)):
+    """
+    Delete a reminder series and its occurrences that were not sent yet.
+    Reminders already sent are kept.
+    """
+    db_series = _get_series(db, series_id)
+    
+    db.execute(delete(ReminderModel).where(pending_occurrences(series_id)).execution_options(synchronize_session=False))
+    db.delete(db_series)
+    db.commit()
+    read_cache.invalidate_namespace("reminders")
+    logger.info(f"Deleted reminder series {series_id}")
+    return None
@@ -1,16 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, delete, union_all, cast, null, false
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import Reminder as ReminderModel, Elderly as ElderlyModel
-from app.schemas import ReminderCreate, Reminder, ReminderUpdate
-from app.services.email_service import email_service
+from typing import List, Optional
+from app.database import get_db, get_read_db
+from app.cache import read_cache
+from app.pagination import paginate, next_cursor_headers
+from app.serialization import schema_columns, rows_to_content, select_fields
+from app.updates import update_returning
+from app.models import Reminder as ReminderModel, ReminderArchive, Elderly as ElderlyModel, SmsRecipient
+from app.schemas import ReminderCreate, Reminder, ReminderUpdate, ReminderListItem
+from app.services.reminder_dispatch import enqueue_reminder, enqueue_due_reminders
 import logging
 from datetime import date
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Unique sort key used for stable ordering and cursor pagination
+LIST_ORDER = (ReminderModel.scheduled_date, ReminderModel.id)
+
+# List responses are built from plain column rows instead of ORM objects
+LIST_COLUMNS = schema_columns(ReminderModel, Reminder)
+# Unbounded text left out of lists unless requested with fields=
+LIST_DEFERRED = ("message",)
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return; message is omitted by default")
+INCLUDE_ARCHIVED_QUERY = Query(False, description="Also return sent reminders moved to the archive")
+DEAD_LETTER_QUERY = Query(None, description="Only reminders whose delivery failed for good (true), or only the others (false)")
+
+def list_statement(columns, elderly_id: int, scheduled_date: date, sent: bool, include_archived: bool,
+                   dead_letter: bool = None):
+    """
+    Reminder list query for the given filters, and the sort key to page it by.
+    With include_archived, archived reminders are merged in with UNION ALL;
+    the filters are applied to each side so that both use their indexes.
+    """
+    def filtered(table):
+        # The archive has no retry state: its reminders were sent
+        stmt = select(*(
+            table.c[column.key] if column.key in table.c else cast(null(), column.type).label(column.key)
+            for column in columns
+        ))
+        
+        # Apply filters if provided
+        if elderly_id:
+            stmt = stmt.where(table.c.elderly_id == elderly_id)
+        if scheduled_date:
+            stmt = stmt.where(table.c.scheduled_date == scheduled_date)
+        if sent is not None:
+            stmt = stmt.where(table.c.sent == sent)
+        if dead_letter is not None:
+            dead = table.c.dead_lettered_at.isnot(None) if "dead_lettered_at" in table.c else false()
+            stmt = stmt.where(dead if dead_letter else ~dead)
+        return stmt
+    
+    stmt = filtered(ReminderModel.__table__)
+    if not include_archived:
+        return stmt, LIST_ORDER
+    merged = union_all(stmt, filtered(ReminderArchive.__table__)).subquery("reminders")
+    return select(merged), (merged.c.scheduled_date, merged.c.id)
+
+def apply_update(db: Session, reminder_id: int, changes: dict) -> dict:
+    """
+    Update a reminder with a single UPDATE ... RETURNING. Raises 404 when it does not exist.
+    """
+    row = update_returning(db, ReminderModel.__table__, reminder_id, changes, returning=LIST_COLUMNS)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return row
+
 @router.post("/", response_model=Reminder, status_code=status.HTTP_201_CREATED)
 def create_reminder(reminder: ReminderCreate, db: Session = Depends(get_db)):
     """
@@ -33,66 +92,77 @@ def create_reminder(reminder: ReminderCreate, db: Session = Depends(get_db)):
     db.add(db_reminder)
     db.commit()
     db.refresh(db_reminder)
+    read_cache.invalidate_lists("reminders")
     logger.info(f"Created reminder for elderly ID {reminder.elderly_id}")
     return db_reminder
 
-@router.get("/", response_model=List[Reminder])
+@router.get("/", response_model=List[ReminderListItem])
 def read_reminders(
     elderly_id: int = None,
     scheduled_date: date = None,
     sent: bool = None,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    dead_letter: bool = DEAD_LETTER_QUERY,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get a list of reminders with optional filtering
+    Get a list of reminders with optional filtering, ordered by scheduled date and ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    Only the columns in `fields` (plus `id` and `scheduled_date`) are read;
+    without it, everything but `message` is returned.
+    Use dead_letter=true to list reminders whose delivery failed for good.
     """
-    query = db.query(ReminderModel)
+    columns = select_fields(LIST_COLUMNS, fields, LIST_ORDER, LIST_DEFERRED)
     
-    # Apply filters if provided
-    if elderly_id:
-        query = query.filter(ReminderModel.elderly_id == elderly_id)
-    if scheduled_date:
-        query = query.filter(ReminderModel.scheduled_date == scheduled_date)
-    if sent is not None:
-        query = query.filter(ReminderModel.sent == sent)
+    def load():
+        query, order = list_statement(columns, elderly_id, scheduled_date, sent, include_archived, dead_letter)
+        rows = db.execute(paginate(query, order, cursor, skip, limit)).all()
+        return rows_to_content(rows), next_cursor_headers(rows, order, limit)
     
-    reminders = query.offset(skip).limit(limit).all()
-    return reminders
+    params = {
+        "elderly_id": elderly_id, "scheduled_date": scheduled_date, "sent": sent,
+        "skip": skip, "limit": limit, "cursor": cursor, "fields": [c.key for c in columns],
+        "include_archived": include_archived, "dead_letter": dead_letter
+    }
+    return read_cache.response("reminders", params, load, response_class=ORJSONResponse, db=db)
 
 @router.get("/{reminder_id}", response_model=Reminder)
-def read_reminder(reminder_id: int, db: Session = Depends(get_db)):
+def read_reminder(reminder_id: int, include_archived: bool = INCLUDE_ARCHIVED_QUERY, db: Session = Depends(get_read_db)):
     """
     Get a reminder by ID
     """
-    reminder = db.query(ReminderModel).filter(ReminderModel.id == reminder_id).first()
-    if not reminder:
-        raise HTTPException(status_code=404, detail="Reminder not found")
-    return reminder
+    def load():
+        reminder = db.query(ReminderModel).filter(ReminderModel.id == reminder_id).first()
+        if not reminder and include_archived:
+            reminder = db.query(ReminderArchive).filter(ReminderArchive.id == reminder_id).first()
+        if not reminder:
+            raise HTTPException(status_code=404, detail="Reminder not found")
+        return jsonable_encoder(Reminder.from_orm(reminder)), {}
+    
+    params = {"include_archived": include_archived}
+    return read_cache.response("reminders", params, load, item_id=reminder_id, db=db)
 
 @router.put("/{reminder_id}", response_model=Reminder)
 def update_reminder(reminder_id: int, reminder: ReminderUpdate, db: Session = Depends(get_db)):
     """
     Update a reminder
     """
-    db_reminder = db.query(ReminderModel).filter(ReminderModel.id == reminder_id).first()
-    if not db_reminder:
-        raise HTTPException(status_code=404, detail="Reminder not found")
-    
     # Update fields that are provided
-    for field, value in reminder.dict(exclude_unset=True).items():
-        setattr(db_reminder, field, value)
-    
+    row = apply_update(db, reminder_id, reminder.dict(exclude_unset=True))
     db.commit()
-    db.refresh(db_reminder)
+    read_cache.invalidate_item("reminders", reminder_id)
     logger.info(f"Updated reminder ID {reminder_id}")
-    return db_reminder
+    return row
 
 @router.post("/{reminder_id}/send", response_model=Reminder)
-def send_reminder(reminder_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+def send_reminder(reminder_id: int, db: Session = Depends(get_db)):
     """
-    Send a reminder by ID
+    Queue a reminder by ID for delivery by the reminder worker.
+    Dead-lettered reminders are retried with a fresh set of attempts.
     """
     db_reminder = db.query(ReminderModel).filter(ReminderModel.id == reminder_id).first()
     if not db_reminder:
@@ -106,46 +176,26 @@ def send_reminder(reminder_id: int, background_tasks: BackgroundTasks, db: Sessi
     if not elderly:
         raise HTTPException(status_code=404, detail="Elderly person not found")
     
-    # Send email in the background
-    background_tasks.add_task(
-        send_reminder_email, 
-        db_reminder.id, 
-        db_reminder.email, 
-        elderly.name, 
-        db_reminder.subject, 
-        db_reminder.message,
-        db
-    )
-    
+    enqueue_reminder(db, db_reminder.id)
+    db.commit()
+    db.refresh(db_reminder)
+    # Its delivery state (attempts, dead letter) was reset
+    read_cache.invalidate_item("reminders", reminder_id)
+    logger.info(f"Queued reminder ID {reminder_id} for delivery")
     return db_reminder
 
 @router.post("/send-due", status_code=status.HTTP_200_OK)
-def send_due_reminders(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+def send_due_reminders(db: Session = Depends(get_db)):
     """
-    Send all due reminders (scheduled for today or earlier that haven't been sent)
+    Queue all due reminders (scheduled for today or earlier that haven't been sent)
+    for delivery by the reminder worker
     """
-    today = date.today()
-    due_reminders = db.query(ReminderModel).filter(
-        ReminderModel.scheduled_date <= today,
-        ReminderModel.sent == False
-    ).all()
-    
-    for reminder in due_reminders:
-        # Get the elderly person
-        elderly = db.query(ElderlyModel).filter(ElderlyModel.id == reminder.elderly_id).first()
-        if elderly:
-            # Send email in the background
-            background_tasks.add_task(
-                send_reminder_email, 
-                reminder.id, 
-                reminder.email, 
-                elderly.name, 
-                reminder.subject, 
-                reminder.message,
-                db
-            )
-    
-    return {"message": f"Sending {len(due_reminders)} due reminders"}
+    queued = enqueue_due_reminders(db, date.today())
+    db.commit()
+    # Reminder series occurrences that fell due are new reminders
+    read_cache.invalidate_lists("reminders")
+    logger.info(f"Queued {queued} due reminders for delivery")
+    return {"message": f"Queued {queued} due reminders"}
 
 @router.delete("/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_reminder(reminder_id: int, db: Session = Depends(get_db)):
@@ -157,26 +207,9 @@ def delete_reminder(reminder_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Reminder not found")
     
     db.delete(db_reminder)
+    # SMS recipients reference reminders without a foreign key
+    db.execute(delete(SmsRecipient).where(SmsRecipient.reminder_id == reminder_id))
     db.commit()
+    read_cache.invalidate_item("reminders", reminder_id)
     logger.info(f"Deleted reminder ID {reminder_id}")
     return None
-
-def send_reminder_email(reminder_id: int, to_email: str, elderly_name: str, subject: str, message: str, db: Session):
-    """
-    Function to send reminder emails in the background
-    """
-    try:
-        # Send the email
-        success = email_service.send_reminder(to_email, elderly_name, subject, message)
-        
-        # Update reminder status
-        db_reminder = db.query(ReminderModel).filter(ReminderModel.id == reminder_id).first()
-        if db_reminder and success:
-            db_reminder.sent = True
-            db_reminder.sent_at = date.today()
-            db.commit()
-            logger.info(f"Sent reminder ID {reminder_id} to {to_email}")
-        elif not success:
-            logger.error(f"Failed to send reminder ID {reminder_id} to {to_email}")
-    except Exception as e:
-        logger.error(f"Error sending reminder: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_read_db
+from app.pagination import paginate, next_cursor_headers
+from app.serialization import schema_columns, rows_to_content
+from app.models import SmsRecipient as SmsRecipientModel
+from app.schemas import SmsRecipient, SmsStatusEnum
+from app.services.sms_service import sms_service
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Unique sort key used for stable ordering and cursor pagination
+LIST_ORDER = (SmsRecipientModel.id,)
+
+# List responses are built from plain column rows instead of ORM objects
+LIST_COLUMNS = schema_columns(SmsRecipientModel, SmsRecipient)
+
+@router.get("/recipients", response_model=List[SmsRecipient])
+def read_sms_recipients(
+    reminder_id: int = None,
+    elderly_id: int = None,
+    phone: str = None,
+    status: SmsStatusEnum = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the SMS recipients of reminders with their delivery status, ordered by ID.
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
+    `phone` is normalized like the stored numbers, so any common format matches.
+    Not cached: statuses change as the SMS worker sends.
+    """
+    query = select(*LIST_COLUMNS)
+    
+    # Apply filters if provided
+    if reminder_id:
+        query = query.where(SmsRecipientModel.reminder_id == reminder_id)
+    if elderly_id:
+        query = query.where(SmsRecipientModel.elderly_id == elderly_id)
+    if phone:
+        # A number that cannot be normalized was never recorded
+        query = query.where(SmsRecipientModel.phone == sms_service.normalize_phone(phone))
+    if status:
+        query = query.where(SmsRecipientModel.status == status)
+    
+    rows = db.execute(paginate(query, LIST_ORDER, cursor, skip, limit)).all()
+    return ORJSONResponse(rows_to_content(rows), headers=next_cursor_headers(rows, LIST_ORDER, limit))
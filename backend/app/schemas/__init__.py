@@ -1,3 +1,7 @@
-from app.schemas.elderly import Elderly, ElderlyCreate, ElderlyUpdate, ElderlyWithRecommendations, RiskLevelEnum
-from app.schemas.recommendation import Recommendation, RecommendationCreate, RecommendationUpdate, RecommendationAdherenceUpdate, CategoryEnum, AdherenceEnum
-from app.schemas.reminder import Reminder, ReminderCreate, ReminderUpdate 
\ No newline at end of file
+from app.schemas.elderly import Elderly, ElderlyCreate, ElderlyUpdate, ElderlyWithRecommendations, ElderlyListItem, RiskLevelEnum
+from app.schemas.recommendation import Recommendation, RecommendationCreate, RecommendationUpdate, RecommendationAdherenceUpdate, CategoryEnum, AdherenceEnum, ExportFormatEnum
+from app.schemas.recommendation import RecommendationBulkCreate, RecommendationBulkResult, BulkItemError, RecommendationListItem
+from app.schemas.reminder import Reminder, ReminderCreate, ReminderUpdate, ReminderListItem
+from app.schemas.reminder_series import ReminderSeries, ReminderSeriesCreate, ReminderSeriesUpdate, ReminderOccurrence
+from app.schemas.analytics import AdherenceGroup, AdherenceGroupByEnum
+from app.schemas.sms import SmsRecipient, SmsStatusEnum 
\ No newline at end of file
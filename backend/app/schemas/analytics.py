@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional
+from enum import Enum
+from app.schemas.elderly import RiskLevelEnum
+from app.schemas.recommendation import CategoryEnum
+
+class AdherenceGroupByEnum(str, Enum):
+    week = "week"
+    category = "category"
+    risk_level = "risk_level"
+
+class AdherenceGroup(BaseModel):
+    week: Optional[int] = None
+    category: Optional[CategoryEnum] = None
+    risk_level: Optional[RiskLevelEnum] = None
+    total: int
+    full: int
+    partial: int
+    none: int
+    pending: int
+    # Rates are relative to the recommendations whose adherence was recorded
+    full_rate: Optional[float] = None
+    partial_rate: Optional[float] = None
+    none_rate: Optional[float] = None
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List
 from datetime import date
 from enum import Enum
+from app.schemas.recommendation import Recommendation
 
 class RiskLevelEnum(str, Enum):
     baixo = "baixo"
@@ -43,8 +44,27 @@ class Elderly(ElderlyBase):
     class Config:
         orm_mode = True
 
+class ElderlyListItem(BaseModel):
+    """
+    An elderly person in a list. Only the fields asked for with `fields` are
+    returned, plus id; by default all but health_conditions and observations.
+    """
+    id: int
+    name: Optional[str] = None
+    age: Optional[int] = None
+    current_week: Optional[int] = None
+    start_date: Optional[date] = None
+    risk_level: Optional[RiskLevelEnum] = None
+    phone: Optional[str] = None
+    caregiver_phone: Optional[str] = None
+    responsible_person: Optional[str] = None
+    health_conditions: Optional[str] = None
+    observations: Optional[str] = None
+    created_at: Optional[date] = None
+    updated_at: Optional[date] = None
+
 class ElderlyWithRecommendations(Elderly):
-    recommendations: List = []
+    recommendations: List[Recommendation] = []
 
     class Config:
         orm_mode = True 
\ No newline at end of file
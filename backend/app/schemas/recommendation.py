@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import date
+import datetime
 from enum import Enum
 
 class CategoryEnum(str, Enum):
@@ -14,10 +15,14 @@ class AdherenceEnum(str, Enum):
     partial = "partial"
     none = "none"
 
+class ExportFormatEnum(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
 class RecommendationBase(BaseModel):
     elderly_id: int
     week: int = Field(..., ge=1, le=16)
-    date: Optional[date] = None
+    date: Optional[datetime.date] = None  # Qualified: the field name shadows the type
     category: CategoryEnum
     content: str = Field(..., min_length=3)
     adherence: Optional[AdherenceEnum] = None
@@ -27,7 +32,7 @@ class RecommendationCreate(RecommendationBase):
 
 class RecommendationUpdate(BaseModel):
     week: Optional[int] = Field(None, ge=1, le=16)
-    date: Optional[date] = None
+    date: Optional[datetime.date] = None
     category: Optional[CategoryEnum] = None
     content: Optional[str] = Field(None, min_length=3)
     adherence: Optional[AdherenceEnum] = None
@@ -40,5 +45,32 @@ class Recommendation(RecommendationBase):
     class Config:
         orm_mode = True
 
+class RecommendationListItem(BaseModel):
+    """
+    A recommendation in a list. Only the fields asked for with `fields` are
+    returned, plus id and week; by default all but content.
+    """
+    id: int
+    week: int
+    elderly_id: Optional[int] = None
+    date: Optional[datetime.date] = None
+    category: Optional[CategoryEnum] = None
+    content: Optional[str] = None
+    adherence: Optional[AdherenceEnum] = None
+    created_at: Optional[datetime.date] = None
+    updated_at: Optional[datetime.date] = None
+
 class RecommendationAdherenceUpdate(BaseModel):
-    adherence: AdherenceEnum 
\ No newline at end of file
+    adherence: AdherenceEnum
+
+class RecommendationBulkCreate(BaseModel):
+    items: List[RecommendationCreate] = Field(..., min_items=1, max_items=10000)
+
+class BulkItemError(BaseModel):
+    index: int
+    elderly_id: int
+    detail: str
+
+class RecommendationBulkResult(BaseModel):
+    created: List[Recommendation]
+    errors: List[BulkItemError] 
\ No newline at end of file
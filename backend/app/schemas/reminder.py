@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 class ReminderBase(BaseModel):
     elderly_id: int
@@ -24,8 +24,34 @@ class Reminder(ReminderBase):
     id: int
     sent: bool
     sent_at: Optional[date]
+    series_id: Optional[int] = None  # Set when the reminder is an occurrence of a reminder series
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None  # Set while a failed reminder waits to be retried
+    dead_lettered_at: Optional[datetime] = None  # Set when delivery failed for good
     created_at: date
     updated_at: date
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class ReminderListItem(BaseModel):
+    """
+    A reminder in a list. Only the fields asked for with `fields` are
+    returned, plus id and scheduled_date; by default all but message.
+    """
+    id: int
+    scheduled_date: date
+    elderly_id: Optional[int] = None
+    email: Optional[str] = None
+    subject: Optional[str] = None
+    message: Optional[str] = None
+    sent: Optional[bool] = None
+    sent_at: Optional[date] = None
+    series_id: Optional[int] = None
+    attempts: Optional[int] = None
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    dead_lettered_at: Optional[datetime] = None
+    created_at: Optional[date] = None
+    updated_at: Optional[date] = None 
\ No newline at end of file
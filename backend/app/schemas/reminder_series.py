@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field, validator
+from typing import Optional
+from datetime import date
+from app.services.reminder_series import parse_rule
+
+RRULE_DESCRIPTION = "RFC 5545 recurrence rule, e.g. FREQ=WEEKLY;COUNT=16 for the 16-week program"
+
+def _check_rule(rule: Optional[str]) -> Optional[str]:
+    if rule is not None:
+        parse_rule(rule, date.today())
+    return rule
+
+def _not_null(value):
+    # Optional in updates means "may be left out", not "may be cleared"
+    if value is None:
+        raise ValueError("may not be null")
+    return value
+
+class ReminderSeriesBase(BaseModel):
+    elderly_id: int
+    email: str = Field(..., min_length=5, max_length=255)
+    subject: str = Field(..., min_length=3, max_length=255)
+    message: str = Field(..., min_length=10)
+    rrule: str = Field(..., max_length=255, description=RRULE_DESCRIPTION)
+    dtstart: date
+
+    _check_rrule = validator("rrule", allow_reuse=True)(_check_rule)
+
+class ReminderSeriesCreate(ReminderSeriesBase):
+    pass
+
+class ReminderSeriesUpdate(BaseModel):
+    email: Optional[str] = Field(None, min_length=5, max_length=255)
+    subject: Optional[str] = Field(None, min_length=3, max_length=255)
+    message: Optional[str] = Field(None, min_length=10)
+    rrule: Optional[str] = Field(None, max_length=255, description=RRULE_DESCRIPTION)
+    dtstart: Optional[date] = None
+    active: Optional[bool] = None
+
+    _check_rrule = validator("rrule", allow_reuse=True)(_check_rule)
+    _check_not_null = validator(
+        "email", "subject", "message", "rrule", "dtstart", "active", pre=True, allow_reuse=True
+    )(_not_null)
+
+class ReminderSeries(ReminderSeriesBase):
+    id: int
+    active: bool
+    next_occurrence: Optional[date]
+    created_at: date
+    updated_at: date
+
+    class Config:
+        orm_mode = True
+
+class ReminderOccurrence(BaseModel):
+    scheduled_date: date
+    reminder_id: Optional[int] = None  # Set once the occurrence has been materialized
+    sent: bool = False
+    sent_at: Optional[date] = None
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+class SmsStatusEnum(str, Enum):
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"
+
+class SmsRecipient(BaseModel):
+    id: int
+    reminder_id: int
+    elderly_id: int
+    phone: str
+    role: str
+    status: SmsStatusEnum
+    attempts: int
+    last_error: Optional[str] = None
+    provider_id: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
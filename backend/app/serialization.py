@@ -0,0 +1,39 @@
+from typing import Optional, Sequence, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> tuple:
+    """
+    Table columns backing every field of a response schema, in field order
+    """
+    table = model.__table__
+    return tuple(table.c[name] for name in schema.__fields__)
+
+
+def rows_to_content(rows: Sequence) -> list:
+    """
+    Turn column tuples selected with schema_columns() into response items.
+    Values are left as dates and enums for an orjson-backed response class
+    to serialize natively, skipping per-row ORM objects and pydantic validation.
+    """
+    return [row._asdict() for row in rows]
+
+
+def select_fields(columns: Sequence, fields: Optional[str], always: Sequence, deferred: Sequence[str]) -> tuple:
+    """
+    Narrow a list endpoint's columns to what the client asked for.
+
+    Without `fields`, every column except the deferred heavy text ones is
+    returned; with a comma-separated `fields`, only those columns plus the
+    `always` ones (ID and sort key, needed for cursors) are read at all.
+    """
+    always_keys = {column.key for column in always}
+    if fields is None:
+        return tuple(c for c in columns if c.key not in deferred or c.key in always_keys)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - {column.key for column in columns}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(c for c in columns if c.key in requested or c.key in always_keys)
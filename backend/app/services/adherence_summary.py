@@ -0,0 +1,155 @@
+from collections import Counter
+from sqlalchemy import select, delete, func, cast, String, text
+from sqlalchemy.orm import Session
+from app.models import (
+    AdherenceSummary, Recommendation as RecommendationModel, Elderly as ElderlyModel,
+    Category, Adherence, RiskLevel
+)
+from app.models.adherence_summary import PENDING
+from app.updates import insert_on_conflict
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY = (
+    AdherenceSummary.week,
+    AdherenceSummary.category,
+    AdherenceSummary.risk_level,
+    AdherenceSummary.adherence,
+)
+
+
+def summary_key(week, category, risk_level, adherence):
+    """
+    Normalize a recommendation's attributes (ORM or pydantic enums) into a summary key
+    """
+    return (
+        week,
+        Category(category),
+        RiskLevel(risk_level or RiskLevel.baixo),
+        Adherence(adherence).value if adherence else PENDING,
+    )
+
+
+def apply_deltas(db: Session, deltas: Counter):
+    """
+    Add the given per-key count deltas to the summary with a single upsert.
+    Runs in the caller's transaction so the summary commits with the change.
+    """
+    rows = [
+        {"week": week, "category": category, "risk_level": risk_level, "adherence": adherence, "count": delta}
+        for (week, category, risk_level, adherence), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = insert_on_conflict(db, AdherenceSummary).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[column.key for column in SUMMARY_KEY],
+        set_={"count": AdherenceSummary.count + stmt.excluded["count"]},
+    )
+    db.execute(stmt)
+
+
+def record_created(db: Session, keys):
+    apply_deltas(db, Counter(keys))
+
+
+def record_deleted(db: Session, keys):
+    deltas = Counter()
+    deltas.subtract(keys)
+    apply_deltas(db, deltas)
+
+
+def record_changed(db: Session, old_key, new_key):
+    if old_key != new_key:
+        apply_deltas(db, Counter({old_key: -1, new_key: 1}))
+
+
+def risk_level_of(db: Session, elderly_id: int):
+    """
+    An elderly person's risk level, for the summary key of a change to one
+    of their recommendations. On PostgreSQL their row stays locked FOR SHARE
+    until the transaction ends, so their risk level cannot change (and move
+    their recommendations to other buckets) before the change is counted.
+    """
+    return db.scalar(
+        select(ElderlyModel.risk_level).where(ElderlyModel.id == elderly_id).with_for_update(read=True)
+    )
+
+
+def recommendation_risk_level(db: Session, recommendation_id: int):
+    """
+    The (elderly_id, risk_level) of a recommendation's elderly person, locked
+    like risk_level_of, or None when the recommendation does not exist
+    """
+    return db.execute(
+        select(ElderlyModel.id.label("elderly_id"), ElderlyModel.risk_level)
+        .join(RecommendationModel, RecommendationModel.elderly_id == ElderlyModel.id)
+        .where(RecommendationModel.id == recommendation_id)
+        .with_for_update(of=ElderlyModel, read=True)
+    ).first()
+
+
+def _elderly_counts(db: Session, elderly_id: int):
+    """
+    Count an elderly person's recommendations per (week, category, adherence)
+    """
+    stmt = (
+        select(RecommendationModel.week, RecommendationModel.category, RecommendationModel.adherence, func.count())
+        .where(RecommendationModel.elderly_id == elderly_id)
+        .group_by(RecommendationModel.week, RecommendationModel.category, RecommendationModel.adherence)
+    )
+    return db.execute(stmt).all()
+
+
+def record_risk_level_changed(db: Session, elderly_id: int, old_risk_level, new_risk_level):
+    """
+    Move all of an elderly person's recommendations to another risk level.
+    Must run after their row is updated: the update waits for the writers
+    holding risk_level_of's lock, so their recommendations are all counted.
+    """
+    if old_risk_level == new_risk_level:
+        return
+    deltas = Counter()
+    for week, category, adherence, count in _elderly_counts(db, elderly_id):
+        deltas[summary_key(week, category, old_risk_level, adherence)] -= count
+        deltas[summary_key(week, category, new_risk_level, adherence)] += count
+    apply_deltas(db, deltas)
+
+
+def record_elderly_deleted(db: Session, elderly_id: int, risk_level):
+    """
+    Remove all of an elderly person's recommendations from the summary.
+    Must run before their recommendations are deleted, with their row locked.
+    """
+    deltas = Counter()
+    for week, category, adherence, count in _elderly_counts(db, elderly_id):
+        deltas[summary_key(week, category, risk_level, adherence)] -= count
+    apply_deltas(db, deltas)
+
+
+def rebuild(db: Session):
+    """
+    Recompute the whole summary from the recommendations table.
+    On PostgreSQL the summary is locked against concurrent updates (reads
+    still go through) so that no delta is lost while it is rebuilt.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE adherence_summary IN EXCLUSIVE MODE"))
+
+    db.execute(delete(AdherenceSummary))
+    risk_level = func.coalesce(ElderlyModel.risk_level, RiskLevel.baixo)
+    adherence = func.coalesce(cast(RecommendationModel.adherence, String), PENDING)
+    source = (
+        select(RecommendationModel.week, RecommendationModel.category, risk_level, adherence, func.count())
+        .join(ElderlyModel, ElderlyModel.id == RecommendationModel.elderly_id)
+        .group_by(RecommendationModel.week, RecommendationModel.category, risk_level, adherence)
+    )
+    db.execute(
+        AdherenceSummary.__table__.insert().from_select(
+            [column.key for column in SUMMARY_KEY] + ["count"], source
+        )
+    )
+    logger.info("Rebuilt adherence summary")
@@ -0,0 +1,211 @@
+import os
+import random
+import smtplib
+import threading
+import time
+from typing import NamedTuple, Optional
+from dotenv import load_dotenv
+from app.services.smtp_pool import SMTPPoolTimeout
+import logging
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# SMTP replies that mean the provider is throttling us rather than refusing the message
+THROTTLE_CODES = (421, 451, 452)
+
+# Longest error text stored on a reminder
+MAX_ERROR_LENGTH = 1000
+
+
+class DeliveryFailure(NamedTuple):
+    error: str
+    retryable: bool
+    throttled: bool = False
+    deferred: bool = False  # Not attempted: the rate limiter had no slot in time
+    retry_after: float = 0.0  # Seconds to wait at least before the next attempt
+
+
+def _smtp_code(error: Exception) -> Optional[int]:
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code
+    if isinstance(error, smtplib.SMTPRecipientsRefused) and error.recipients:
+        return min(code for code, _ in error.recipients.values())
+    return None
+
+
+def classify_error(error: Exception) -> DeliveryFailure:
+    """
+    Sort a send error into permanent (5xx about the recipient or message),
+    throttling (421/451/452) or other transient failures (other 4xx,
+    connection errors, timeouts and authentication or sender problems, which
+    are not the message's fault). Any other exception is permanent.
+    """
+    code = _smtp_code(error)
+    text = f"{type(error).__name__}: {str(error)}"[:MAX_ERROR_LENGTH]
+    if code is not None:
+        permanent = code >= 500 and not isinstance(error, (smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused))
+        return DeliveryFailure(text, retryable=not permanent, throttled=code in THROTTLE_CODES)
+    # smtplib errors are OSErrors too
+    return DeliveryFailure(text, retryable=isinstance(error, (OSError, SMTPPoolTimeout)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate adapts to throttling (AIMD).
+
+    Sends are spread at `rate` messages/sec with bursts of up to `burst`.
+    Every success raises the rate by increase/rate, i.e. by about `increase`
+    msg/s per second of sending, up to max_rate. A throttling reply cuts the
+    rate by `decrease` and pauses all sends; throttles right after a pause
+    double it (up to max_pause), while throttles from sends that were already
+    in flight are ignored, so one burst of replies is one slowdown.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float = 0.5, burst: float = None, increase: float = 0.5,
+                 decrease: float = 0.7, pause: float = 30.0, max_pause: float = 900.0, name: str = "SMTP"):
+        self.name = name  # Of the provider, for logs
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.burst = burst or max(1.0, max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.pause = pause
+        self.max_pause = max_pause
+        self.throttles = 0
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()  # Tokens are not refilled before this time
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait for a send slot. Returns False, without waiting, when none
+        would be free within max_wait seconds.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(self._updated - now, 0.0) + max((1 - self._tokens) / self.rate, 0.0)
+                if wait <= 0:
+                    self._tokens -= 1
+                    return True
+                if max_wait is not None and wait > max_wait:
+                    return False
+            # Re-checked after sleeping: other threads may have taken the slot or hit a throttle
+            time.sleep(wait)
+            if max_wait is not None:
+                max_wait -= wait
+
+    def resume_in(self) -> float:
+        """
+        Seconds until the current throttling pause ends
+        """
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def succeeded(self):
+        with self._lock:
+            self._consecutive_throttles = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def throttled(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return
+            self._consecutive_throttles += 1
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            pause = min(self.max_pause, self.pause * 2 ** (self._consecutive_throttles - 1))
+            self._tokens = 0.0
+            self._updated = self._paused_until = now + pause
+        logger.warning(f"{self.name} provider is throttling; pausing sends for {pause:.1f} s, then {self.rate:.2f} msg/s")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "throttles": self.throttles,
+                "paused_for": round(max(self._paused_until - time.monotonic(), 0.0), 1),
+            }
+
+
+class DeliveryController:
+    """
+    Paces sends through an adaptive rate limiter and decides what happens
+    to a message whose send failed: retry with exponential backoff and
+    jitter, or dead-letter once it is permanent or out of attempts.
+    `classify` turns a send error into a DeliveryFailure.
+    """
+
+    def __init__(self, limiter: AdaptiveRateLimiter, max_attempts: int = 5, retry_base_delay: float = 60.0,
+                 retry_max_delay: float = 3600.0, max_wait: float = 10.0, classify=classify_error):
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        # Longest a send waits for a slot before its message is put back for later
+        self.max_wait = max_wait
+        self.classify = classify
+
+    def deliver(self, send) -> Optional[DeliveryFailure]:
+        """
+        Call send() once a rate limiter slot is free. Returns None when it
+        succeeded, or the failure.
+        """
+        if not self.limiter.acquire(self.max_wait):
+            return DeliveryFailure(
+                "Deferred by the send rate limiter", retryable=True, deferred=True,
+                retry_after=max(self.limiter.resume_in(), self.max_wait),
+            )
+        try:
+            send()
+        except Exception as e:
+            failure = self.classify(e)
+            if failure.throttled:
+                self.limiter.throttled()
+                failure = failure._replace(retry_after=self.limiter.resume_in())
+            logger.warning(f"Failed to send: {failure.error}")
+            return failure
+        self.limiter.succeeded()
+        return None
+
+    def retry_delay(self, attempts: int, failure: DeliveryFailure) -> Optional[float]:
+        """
+        Seconds until the next attempt after `attempts` failed ones, or None
+        when the message should be dead-lettered
+        """
+        if not failure.retryable or attempts >= self.max_attempts:
+            return None
+        # Exponential backoff with "equal" jitter: half fixed, half random
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+        return max(ceiling / 2 + random.uniform(0, ceiling / 2), failure.retry_after)
+
+
+# Create a singleton instance (email reminders)
+delivery_controller = DeliveryController(
+    AdaptiveRateLimiter(
+        max_rate=float(os.getenv("SMTP_RATE_LIMIT", "10")),
+        min_rate=float(os.getenv("SMTP_RATE_LIMIT_MIN", "0.5")),
+        burst=float(os.getenv("SMTP_RATE_BURST", "0")) or None,
+        pause=float(os.getenv("SMTP_THROTTLE_PAUSE", "30")),
+        max_pause=float(os.getenv("SMTP_THROTTLE_MAX_PAUSE", "900")),
+    ),
+    max_attempts=int(os.getenv("REMINDER_MAX_ATTEMPTS", "5")),
+    retry_base_delay=float(os.getenv("REMINDER_RETRY_BASE_DELAY", "60")),
+    retry_max_delay=float(os.getenv("REMINDER_RETRY_MAX_DELAY", "3600")),
+    max_wait=float(os.getenv("SMTP_RATE_MAX_WAIT", "10")),
+)
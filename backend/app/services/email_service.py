@@ -1,8 +1,12 @@
 import smtplib
 import os
+from email.charset import Charset
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import formataddr
 from dotenv import load_dotenv
+from app.services.smtp_pool import SMTPConnectionPool
+from app.services.email_templates import EmailTemplates, DEFAULT_LOCALE
 import logging
 
 # Load environment variables
@@ -10,6 +14,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Shared by every message part (base64 body encoding)
+UTF8 = Charset("utf-8")
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -18,71 +25,92 @@ class EmailService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", "noreply@elderlycare.com")
         self.from_name = os.getenv("FROM_NAME", "Elderly Care System")
+        self.smtp_use_tls = os.getenv("SMTP_USE_TLS", "True").lower() in ("1", "true", "yes")
+        self.locale = os.getenv("EMAIL_LOCALE", DEFAULT_LOCALE)
+        self.from_header = formataddr((self.from_name, self.from_email))
+
+        # Templates are compiled on first use and cached per name and locale
+        self.templates = EmailTemplates(from_name=self.from_name)
+
+        # Authenticated sessions are reused across messages instead of paying
+        # the TCP + STARTTLS + AUTH handshake for every email
+        self.pool = SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            username=self.smtp_username,
+            password=self.smtp_password,
+            max_size=int(os.getenv("SMTP_POOL_SIZE", "5")),
+            use_tls=self.smtp_use_tls,
+            acquire_timeout=float(os.getenv("SMTP_POOL_ACQUIRE_TIMEOUT", "30")),
+            idle_timeout=float(os.getenv("SMTP_POOL_IDLE_TIMEOUT", "60")),
+        )
 
-    def send_email(self, to_email, subject, message):
+    def build_message(self, to_email, subject, html, text=None):
         """
-        Send an email using SMTP
+        Build the MIME message for an HTML body, as multipart/alternative
+        with a plain-text part first when text is given
         """
-        try:
-            # Create message
+        if text is None:
             msg = MIMEMultipart()
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = to_email
-            msg["Subject"] = subject
-
-            # Add message body
-            msg.attach(MIMEText(message, "html"))
+        else:
+            msg = MIMEMultipart("alternative")
+            msg.attach(MIMEText(text, "plain", UTF8))
+        msg.attach(MIMEText(html, "html", UTF8))
+        msg["From"] = self.from_header
+        msg["To"] = to_email
+        msg["Subject"] = subject
+        return msg
 
-            # Connect to SMTP server
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
+    def send_email(self, to_email, subject, message, text=None, raise_errors=False):
+        """
+        Send an email using a pooled SMTP session. message is the HTML body;
+        text, when given, is sent as its plain-text alternative.
+        Returns whether it was sent, or raises the error with raise_errors.
+        """
+        try:
+            msg = self.build_message(to_email, subject, message, text)
 
-            # Send email
-            server.send_message(msg)
-            server.quit()
+            try:
+                with self.pool.connection() as server:
+                    server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # The server may have dropped an idle session; retry once on a fresh one
+                with self.pool.connection() as server:
+                    server.send_message(msg)
 
             logger.info(f"Email sent to {to_email}")
             return True
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Failed to send email: {str(e)}")
             return False
 
-    def send_reminder(self, to_email, elderly_name, subject, message):
+    def send_reminder(self, to_email, elderly_name, subject, message, locale=None, raise_errors=False):
         """
         Send a reminder email about an elderly person
         """
-        html_message = f"""
-        <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background-color: #1976d2; color: white; padding: 10px; text-align: center; }}
-                    .content {{ padding: 20px; background-color: #f9f9f9; }}
-                    .footer {{ text-align: center; margin-top: 20px; font-size: 12px; color: #777; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h2>Lembrete de Acompanhamento</h2>
-                    </div>
-                    <div class="content">
-                        <p>Olá,</p>
-                        <p>Este é um lembrete para o acompanhamento de <strong>{elderly_name}</strong>.</p>
-                        <p>{message}</p>
-                        <p>Obrigado por seu trabalho no cuidado aos idosos!</p>
-                    </div>
-                    <div class="footer">
-                        <p>Este é um email automático. Por favor, não responda.</p>
-                        <p>© {self.from_name}</p>
-                    </div>
-                </div>
-            </body>
-        </html>
+        rendered = self.templates.render(
+            "reminder", locale or self.locale, elderly_name=elderly_name, message=message
+        )
+        return self.send_email(to_email, subject, rendered.html, rendered.text, raise_errors)
+
+    def send_digest(self, to_email, reminders, locale=None, raise_errors=False):
         """
-        return self.send_email(to_email, subject, html_message)
+        Send several reminders to the same recipient as one email.
+        reminders is a list of (elderly_name, subject, message) tuples.
+        """
+        if len(reminders) == 1:
+            return self.send_reminder(to_email, *reminders[0], locale=locale, raise_errors=raise_errors)
+
+        rendered = self.templates.render(
+            "digest", locale or self.locale,
+            reminders=[
+                {"elderly_name": elderly_name, "subject": subject, "message": message}
+                for elderly_name, subject, message in reminders
+            ],
+        )
+        return self.send_email(to_email, rendered.subject, rendered.html, rendered.text, raise_errors)
 
 
 # Create a singleton instance
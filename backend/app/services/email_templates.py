@@ -0,0 +1,85 @@
+import os
+import threading
+from typing import NamedTuple, Optional
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+DEFAULT_LOCALE = "pt_BR"
+
+
+class RenderedEmail(NamedTuple):
+    subject: Optional[str]  # None when the template has no .subject part
+    html: str
+    text: str
+
+
+class CompiledEmail(NamedTuple):
+    subject: Optional[object]
+    html: object
+    text: object
+
+
+class EmailTemplates:
+    """
+    Email templates, compiled once and cached by (name, locale).
+
+    A template is a set of files in <locale>/: <name>.html, <name>.txt and
+    optionally <name>.subject. Locales without a template fall back to the
+    default locale. HTML parts are autoescaped, so names and messages are
+    rendered as text; the static layout (base.html) is compiled into the
+    template and not rebuilt per message.
+    """
+
+    def __init__(self, directory: str = TEMPLATE_DIR, default_locale: str = DEFAULT_LOCALE, **globals):
+        self.default_locale = default_locale
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            auto_reload=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=False,
+        )
+        self.env.globals.update(globals)
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, locale: str) -> CompiledEmail:
+        for candidate in dict.fromkeys((locale, self.default_locale)):
+            try:
+                html = self.env.get_template(f"{candidate}/{name}.html")
+                text = self.env.get_template(f"{candidate}/{name}.txt")
+            except TemplateNotFound:
+                continue
+            try:
+                subject = self.env.get_template(f"{candidate}/{name}.subject")
+            except TemplateNotFound:
+                subject = None
+            if candidate != locale:
+                logger.warning(f"No {locale} email template {name}, using {candidate}")
+            return CompiledEmail(subject, html, text)
+        raise TemplateNotFound(f"{locale}/{name}")
+
+    def get(self, name: str, locale: Optional[str] = None) -> CompiledEmail:
+        """
+        Compiled parts of a template, loading them on first use
+        """
+        key = (name, locale or self.default_locale)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key)
+                if compiled is None:
+                    compiled = self._compiled[key] = self._load(*key)
+        return compiled
+
+    def render(self, name: str, locale: Optional[str] = None, **context) -> RenderedEmail:
+        """
+        Render every part of a template with the per-message fields
+        """
+        compiled = self.get(name, locale)
+        subject = compiled.subject.render(context).strip() if compiled.subject else None
+        return RenderedEmail(subject, compiled.html.render(context), compiled.text.render(context))
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from sqlalchemy import select
+from app.database import read_session
+from app.models import Recommendation as RecommendationModel, Elderly as ElderlyModel
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    RecommendationModel.id,
+    RecommendationModel.elderly_id,
+    ElderlyModel.name.label("elderly_name"),
+    ElderlyModel.risk_level,
+    RecommendationModel.week,
+    RecommendationModel.date,
+    RecommendationModel.category,
+    RecommendationModel.content,
+    RecommendationModel.adherence,
+    RecommendationModel.created_at,
+    RecommendationModel.updated_at,
+)
+FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_statement():
+    """
+    Base statement for the export: recommendations joined with their elderly person
+    """
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(ElderlyModel, ElderlyModel.id == RecommendationModel.elderly_id)
+        .order_by(RecommendationModel.id)
+    )
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELD_NAMES)
+    writer.writerows([[_plain(value) for value in row] for row in rows])
+    return buffer.getvalue()
+
+
+def _encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps({name: _plain(value) for name, value in zip(FIELD_NAMES, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def stream_export(stmt, export_format: str, sticky: bool = False):
+    """
+    Yield the export one batch at a time.
+
+    The rows are read through a server-side cursor (yield_per), so memory
+    stays flat regardless of how many rows match. The generator opens its
+    own read session (on a replica unless sticky) because it keeps running
+    after the request handler returns.
+    """
+    db = read_session(sticky)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if export_format == "csv":
+            yield _encode_csv([], header=True)
+        for rows in result.partitions():
+            if export_format == "csv":
+                yield _encode_csv(rows, header=False)
+            else:
+                yield _encode_ndjson(rows)
+    finally:
+        db.close()
@@ -0,0 +1,153 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from sqlalchemy import select, delete, text
+from sqlalchemy.exc import ProgrammingError, OperationalError
+from sqlalchemy.orm import Session
+from app.models import Reminder as ReminderModel, ReminderArchive
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns copied from reminders (the archive has no queue state and stamps archived_at)
+ARCHIVED_COLUMNS = [column.key for column in ReminderArchive.__table__.c if column.key != "archived_at"]
+
+# Monthly partitions of reminders when it is partitioned (PostgreSQL, see migration 0007)
+PARTITION_PREFIX = "reminders_p"
+
+
+def archive_cutoff(older_than_days: int, today: date = None) -> date:
+    """
+    Reminders scheduled before this date are old enough to archive
+    """
+    return (today or date.today()) - timedelta(days=older_than_days)
+
+
+def archive_batch(db: Session, cutoff: date, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Move up to batch_size sent reminders scheduled before cutoff into the
+    archive, within the caller's transaction. Returns how many were moved.
+
+    The batch is claimed with FOR UPDATE SKIP LOCKED, so it never waits on
+    rows the API or the delivery worker are holding, and the rows stay
+    locked only until the caller commits.
+    """
+    ids = db.scalars(
+        select(ReminderModel.id)
+        .where(ReminderModel.sent == True, ReminderModel.scheduled_date < cutoff)  # noqa: E712
+        .order_by(ReminderModel.scheduled_date, ReminderModel.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not ids:
+        return 0
+
+    source = select(*(ReminderModel.__table__.c[key] for key in ARCHIVED_COLUMNS)).where(ReminderModel.id.in_(ids))
+    db.execute(ReminderArchive.__table__.insert().from_select(ARCHIVED_COLUMNS, source))
+    db.execute(
+        delete(ReminderModel)
+        .where(ReminderModel.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    return len(ids)
+
+
+def archive_sent_reminders(db: Session, older_than_days: int, batch_size: int = DEFAULT_BATCH_SIZE,
+                           pause: float = 0.0, max_batches: Optional[int] = None) -> int:
+    """
+    Archive every sent reminder scheduled more than older_than_days ago.
+    Each batch is its own short transaction; `pause` seconds between
+    batches leave room for other writers on a busy database.
+    """
+    cutoff = archive_cutoff(older_than_days)
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        try:
+            moved = archive_batch(db, cutoff, batch_size)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        logger.info(f"Archived {moved} reminders scheduled before {cutoff} ({total} so far)")
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def is_partitioned(db: Session) -> bool:
+    """
+    Whether reminders is a partitioned table (only ever on PostgreSQL)
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'reminders')"
+    )).scalar()
+
+
+def monthly_partitions(db: Session) -> List[str]:
+    """
+    Names of the monthly partitions of reminders, oldest first
+    """
+    return db.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'reminders' AND c.relname LIKE :prefix ORDER BY c.relname"
+    ), {"prefix": f"{PARTITION_PREFIX}%"}).all()
+
+
+def create_partitions(db: Session, months_ahead: int, today: date = None) -> List[str]:
+    """
+    Create the monthly partitions of reminders up to months_ahead from now.
+    A month whose rows already landed in the default partition is skipped
+    with a warning (its rows stay readable there).
+    """
+    today = today or date.today()
+    existing = set(monthly_partitions(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(today, offset)
+        name = f"{PARTITION_PREFIX}{start:%Y_%m}"
+        if name in existing:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF reminders "
+                    f"FOR VALUES FROM ('{start}') TO ('{_month_start(start, 1)}')"
+                ))
+            created.append(name)
+        except (ProgrammingError, OperationalError) as e:
+            logger.warning(f"Could not create reminder partition {name}: {str(e)}")
+    return created
+
+
+def drop_empty_partitions(db: Session, before: date) -> List[str]:
+    """
+    Drop the monthly partitions of reminders that end on or before `before`
+    and no longer hold any rows, i.e. months that were fully archived
+    """
+    dropped = []
+    for name in monthly_partitions(db):
+        start = date(int(name[-7:-3]), int(name[-2:]), 1)
+        if _month_start(start, 1) > before:
+            break
+        if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            continue
+        db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
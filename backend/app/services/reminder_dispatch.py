@@ -0,0 +1,246 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.orm import Session
+from app.models import Reminder as ReminderModel, Elderly as ElderlyModel
+from app.services.email_service import email_service
+from app.services.delivery import delivery_controller
+from app.services.reminder_series import expand_series
+from app.services.sms_service import sms_service
+from app.services.sms_dispatch import add_sms_recipients
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def enqueue_reminder(db: Session, reminder_id: int) -> int:
+    """
+    Hand a single unsent reminder to the delivery worker right away. A
+    dead-lettered reminder or one waiting for a retry starts over with a
+    fresh set of attempts. With SMS enabled, its recipients are recorded too.
+    """
+    result = db.execute(
+        update(ReminderModel)
+        .where(ReminderModel.id == reminder_id, ReminderModel.sent == False)  # noqa: E712
+        .values(queued_at=func.now(), attempts=0, next_attempt_at=None, dead_lettered_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount and sms_service.enabled:
+        add_sms_recipients(db, [reminder_id])
+    return result.rowcount
+
+
+def enqueue_due_statement(today: date):
+    """
+    The UPDATE that queues every due, unsent and not yet queued reminder,
+    leaving dead-lettered ones alone
+    """
+    return (
+        update(ReminderModel)
+        .where(
+            ReminderModel.scheduled_date <= today,
+            ReminderModel.sent == False,  # noqa: E712
+            ReminderModel.queued_at.is_(None),
+            ReminderModel.dead_lettered_at.is_(None),
+        )
+        .values(queued_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def enqueue_due_reminders(db: Session, today: date = None) -> int:
+    """
+    Hand every due, unsent and not yet queued reminder to the delivery
+    worker with a single UPDATE. Reminder series occurrences due by today
+    are materialized first. Dead-lettered reminders are left alone. With SMS
+    enabled, the queued reminders' SMS recipients are recorded too.
+    """
+    today = today or date.today()
+    expand_series(db, today)
+    stmt = enqueue_due_statement(today)
+    if not sms_service.enabled:
+        return db.execute(stmt).rowcount
+
+    queued_ids = db.scalars(stmt.returning(ReminderModel.id)).all()
+    add_sms_recipients(db, queued_ids)
+    return len(queued_ids)
+
+
+def _queued_reminders(now: datetime):
+    """
+    Queued reminders that are not waiting for a retry, joined with the
+    elderly name, locked FOR UPDATE SKIP LOCKED
+    """
+    return (
+        select(
+            ReminderModel.id,
+            ReminderModel.email,
+            ReminderModel.subject,
+            ReminderModel.message,
+            ReminderModel.attempts,
+            ElderlyModel.name.label("elderly_name"),
+        )
+        .join(ElderlyModel, ElderlyModel.id == ReminderModel.elderly_id)
+        .where(
+            ReminderModel.sent == False,  # noqa: E712
+            ReminderModel.queued_at.isnot(None),
+            or_(ReminderModel.next_attempt_at.is_(None), ReminderModel.next_attempt_at <= now),
+        )
+        .with_for_update(of=ReminderModel, skip_locked=True)
+    )
+
+
+def claim_batch_statement(batch_size: int, now: datetime):
+    """
+    The SELECT that claims the next batch of queued reminders, oldest first
+    """
+    return _queued_reminders(now).order_by(ReminderModel.queued_at, ReminderModel.id).limit(batch_size)
+
+
+def claim_batch(db: Session, batch_size: int = DEFAULT_BATCH_SIZE, now: datetime = None):
+    """
+    Lock and return a batch of queued reminders joined with the elderly name.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers each
+    claim a disjoint batch. The locks are held until the caller commits.
+    """
+    return db.execute(claim_batch_statement(batch_size, now or datetime.now())).all()
+
+
+def claim_recipient_reminders(db: Session, rows, now: datetime = None):
+    """
+    Lock and return the other queued reminders of the recipients of a
+    claimed batch, so that each recipient gets a single digest
+    """
+    stmt = _queued_reminders(now or datetime.now()).where(
+        func.lower(func.trim(ReminderModel.email)).in_({row.email.strip().lower() for row in rows}),
+        ReminderModel.id.notin_([row.id for row in rows]),
+    )
+    return db.execute(stmt).all()
+
+
+def _send_row(row):
+    return delivery_controller.deliver(
+        lambda: email_service.send_reminder(row.email, row.elderly_name, row.subject, row.message, raise_errors=True)
+    )
+
+
+def send_rows(rows, executor: ThreadPoolExecutor):
+    """
+    Send a batch of reminder rows concurrently, paced by the delivery
+    controller. Returns (row, failure) pairs, with failure None when sent.
+    """
+    return list(zip(rows, executor.map(_send_row, rows)))
+
+
+def _send_digest(rows):
+    reminders = [(row.elderly_name, row.subject, row.message) for row in rows]
+    return delivery_controller.deliver(
+        lambda: email_service.send_digest(rows[0].email, reminders, raise_errors=True)
+    )
+
+
+def group_by_recipient(rows) -> list:
+    """
+    Group reminder rows by recipient address (case-insensitively), in batch order
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.email.strip().lower(), []).append(row)
+    return list(groups.values())
+
+
+def send_digests(rows, executor: ThreadPoolExecutor):
+    """
+    Send one email per recipient covering all of their reminders, concurrently.
+    Returns (row, failure) pairs; every reminder in a digest shares its outcome.
+    """
+    groups = group_by_recipient(rows)
+    results = list(executor.map(_send_digest, groups))
+    return [(row, failure) for group, failure in zip(groups, results) for row in group]
+
+
+def record_outcome(db: Session, outcomes, now: datetime = None):
+    """
+    Record the outcome of a batch: one UPDATE for the sent reminders, and
+    one executemany UPDATE each for retries and dead letters.
+
+    A failed reminder stays queued with its attempt count, last error and
+    the time of its next attempt, chosen by the delivery controller. Once it
+    fails permanently or runs out of attempts it is dead-lettered: taken off
+    the queue and skipped by enqueue_due_reminders until it is sent again by
+    hand. Reminders deferred by the rate limiter were not attempted.
+    """
+    now = now or datetime.now()
+    sent_ids = [row.id for row, failure in outcomes if failure is None]
+    if sent_ids:
+        db.execute(
+            update(ReminderModel)
+            .where(ReminderModel.id.in_(sent_ids))
+            .values(
+                sent=True, sent_at=now.date(), queued_at=None, next_attempt_at=None,
+                attempts=ReminderModel.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    retries, deferred, dead = [], [], []
+    for row, failure in outcomes:
+        if failure is None:
+            continue
+        if failure.deferred:
+            deferred.append({"id": row.id, "next_attempt_at": now + timedelta(seconds=failure.retry_after)})
+            continue
+        attempts = row.attempts + 1
+        delay = delivery_controller.retry_delay(attempts, failure)
+        if delay is None:
+            dead.append({"id": row.id, "attempts": attempts, "last_error": failure.error})
+        else:
+            retries.append({
+                "id": row.id, "attempts": attempts, "last_error": failure.error,
+                "next_attempt_at": now + timedelta(seconds=delay),
+            })
+    if retries:
+        db.execute(update(ReminderModel), retries)
+    if deferred:
+        db.execute(update(ReminderModel), deferred)
+    if dead:
+        db.execute(
+            update(ReminderModel).values(queued_at=None, next_attempt_at=None, dead_lettered_at=now),
+            dead,
+        )
+    return len(retries) + len(deferred), len(dead)
+
+
+def process_batch(db: Session, executor: ThreadPoolExecutor, batch_size: int = DEFAULT_BATCH_SIZE,
+                  digest: bool = False) -> int:
+    """
+    Claim, send and record one batch of reminders. Returns the batch size.
+
+    In digest mode the batch is widened to every queued reminder of its
+    recipients, and each recipient gets one combined email. The outcome of
+    all reminders in a digest is recorded in the same transaction.
+    """
+    try:
+        now = datetime.now()
+        rows = claim_batch(db, batch_size, now)
+        if not rows:
+            db.commit()
+            return 0
+        if digest:
+            rows += claim_recipient_reminders(db, rows, now)
+            outcomes = send_digests(rows, executor)
+        else:
+            outcomes = send_rows(rows, executor)
+        retried, dead = record_outcome(db, outcomes)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    emails = f" in {len(group_by_recipient(rows))} emails" if digest else ""
+    sent = len(rows) - retried - dead
+    logger.info(f"Processed reminder batch: {sent} sent, {retried} to retry, {dead} dead-lettered{emails}")
+    return len(rows)
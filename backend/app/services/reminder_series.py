@@ -0,0 +1,145 @@
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from dateutil.rrule import rrulestr
+from sqlalchemy import select, update, delete
+from sqlalchemy.orm import Session
+from app.models import Reminder as ReminderModel, ReminderSeries
+from app.updates import insert_on_conflict
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Occurrences are dates, so rules may not repeat more than once a day
+SUB_DAILY_FREQ = re.compile(r"FREQ=(HOURLY|MINUTELY|SECONDLY)", re.IGNORECASE)
+
+
+def parse_rule(rule: str, dtstart: date):
+    """
+    Parse a recurrence rule (e.g. FREQ=WEEKLY;COUNT=16) anchored at dtstart.
+    Raises ValueError for invalid or sub-daily rules.
+    """
+    if SUB_DAILY_FREQ.search(rule):
+        raise ValueError("Recurrence rules may not repeat more often than daily")
+    try:
+        return rrulestr(rule, dtstart=datetime.combine(dtstart, time.min))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {str(e)}")
+
+
+def occurrences(rule: str, dtstart: date, start: date, end: date) -> List[date]:
+    """
+    Dates of the occurrences between start and end, inclusive. Rules with
+    BYHOUR and the like fall later on the day than midnight, so the whole
+    end day is included, and days with several occurrences appear once.
+    """
+    recurrence = parse_rule(rule, dtstart)
+    moments = recurrence.between(datetime.combine(start, time.min), datetime.combine(end, time.max), inc=True)
+    return list(dict.fromkeys(moment.date() for moment in moments))
+
+
+def first_occurrence(rule: str, dtstart: date, on_or_after: date) -> Optional[date]:
+    """
+    The first occurrence on or after the given date, or None once the rule is exhausted
+    """
+    moment = parse_rule(rule, dtstart).after(datetime.combine(on_or_after, time.min), inc=True)
+    return moment.date() if moment else None
+
+
+def _insert_occurrences(db: Session, rows: list):
+    """
+    Insert occurrence reminders, skipping the ones that already exist
+    """
+    db.execute(
+        insert_on_conflict(db, ReminderModel).values(rows).on_conflict_do_nothing(index_elements=["series_id", "scheduled_date"])
+    )
+
+
+def expand_series(db: Session, through: date, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Materialize the occurrences of active series due on or before `through`
+    as reminders, within the caller's transaction. Returns how many were
+    expanded.
+
+    Only series whose next occurrence is due are read (series are locked
+    with FOR UPDATE SKIP LOCKED, so concurrent callers split the work), and
+    future occurrences are never stored.
+    """
+    created = 0
+    while True:
+        batch = db.scalars(
+            select(ReminderSeries)
+            .where(ReminderSeries.active == True, ReminderSeries.next_occurrence <= through)  # noqa: E712
+            .order_by(ReminderSeries.next_occurrence, ReminderSeries.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not batch:
+            return created
+
+        rows = []
+        for series in batch:
+            for day in occurrences(series.rrule, series.dtstart, series.next_occurrence, through):
+                rows.append({
+                    "elderly_id": series.elderly_id,
+                    "series_id": series.id,
+                    "scheduled_date": day,
+                    "email": series.email,
+                    "subject": series.subject,
+                    "message": series.message,
+                    "sent": False,
+                })
+            series.next_occurrence = first_occurrence(series.rrule, series.dtstart, through + timedelta(days=1))
+        if rows:
+            _insert_occurrences(db, rows)
+        db.flush()
+        created += len(rows)
+        logger.info(f"Expanded {len(rows)} occurrences of {len(batch)} reminder series due by {through}")
+
+
+def pending_occurrences(series_id: int):
+    """
+    Condition matching the materialized occurrences of a series that are
+    neither sent nor handed to the delivery worker yet
+    """
+    return (
+        (ReminderModel.series_id == series_id)
+        & (ReminderModel.sent == False)  # noqa: E712
+        & ReminderModel.queued_at.is_(None)
+    )
+
+
+def apply_series_update(db: Session, series: ReminderSeries, changes: dict, today: date = None) -> int:
+    """
+    Apply changes to a series and to its pending occurrences. A new schedule
+    (or resuming a paused series) takes effect from today: pending
+    occurrences from today on are dropped and re-expanded from the new rule.
+    Returns how many existing reminders were changed or removed.
+    """
+    today = today or date.today()
+    rescheduled = "rrule" in changes or "dtstart" in changes or (changes.get("active") and not series.active)
+    for field, value in changes.items():
+        setattr(series, field, value)
+
+    affected = 0
+    if rescheduled:
+        result = db.execute(
+            delete(ReminderModel)
+            .where(pending_occurrences(series.id), ReminderModel.scheduled_date >= today)
+            .execution_options(synchronize_session=False)
+        )
+        affected += result.rowcount
+        series.next_occurrence = first_occurrence(series.rrule, series.dtstart, max(today, series.dtstart))
+
+    content = {field: changes[field] for field in ("email", "subject", "message") if field in changes}
+    if content:
+        result = db.execute(
+            update(ReminderModel)
+            .where(pending_occurrences(series.id))
+            .values(**content)
+            .execution_options(synchronize_session=False)
+        )
+        affected += result.rowcount
+    return affected
@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.orm import Session
+from app.models import Reminder as ReminderModel, ReminderArchive, Elderly as ElderlyModel, SmsRecipient, SmsStatus
+from app.services.delivery import DeliveryFailure
+from app.services.sms_service import sms_service
+from app.updates import insert_on_conflict
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Reminders looked up per query when recording recipients
+ID_CHUNK_SIZE = 500
+
+
+def _insert_recipients(db: Session, rows: list):
+    """
+    Insert recipients, skipping numbers a reminder already has
+    """
+    db.execute(
+        insert_on_conflict(db, SmsRecipient).values(rows).on_conflict_do_nothing(index_elements=["reminder_id", "phone"])
+    )
+
+
+def add_sms_recipients(db: Session, reminder_ids: List[int]) -> int:
+    """
+    Record the numbers to text for the given reminders, within the caller's
+    transaction: the elderly person's phone and the caregiver's, normalized
+    to E.164, once per number. Missing or implausible numbers are skipped.
+    Returns how many numbers were found, including ones already recorded.
+    """
+    added = 0
+    for start in range(0, len(reminder_ids), ID_CHUNK_SIZE):
+        reminders = db.execute(
+            select(ReminderModel.id, ReminderModel.elderly_id, ElderlyModel.phone, ElderlyModel.caregiver_phone)
+            .join(ElderlyModel, ElderlyModel.id == ReminderModel.elderly_id)
+            .where(ReminderModel.id.in_(reminder_ids[start:start + ID_CHUNK_SIZE]))
+        ).all()
+
+        rows = []
+        for reminder in reminders:
+            phones = set()
+            for role, raw in (("elderly", reminder.phone), ("caregiver", reminder.caregiver_phone)):
+                phone = sms_service.normalize_phone(raw)
+                if phone and phone not in phones:
+                    phones.add(phone)
+                    rows.append({
+                        "reminder_id": reminder.id,
+                        "elderly_id": reminder.elderly_id,
+                        "phone": phone,
+                        "role": role,
+                        "status": SmsStatus.pending,
+                    })
+        if rows:
+            _insert_recipients(db, rows)
+        added += len(rows)
+    return added
+
+
+def claim_sms_batch(db: Session, batch_size: int = DEFAULT_BATCH_SIZE, now: datetime = None):
+    """
+    Lock and return a batch of pending recipients that are not waiting for a
+    retry, joined with their reminder's text and the elderly name. The
+    reminder may have been archived since its recipients were recorded;
+    subject and message are None when it no longer exists at all.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers each
+    claim a disjoint batch. The locks are held until the caller commits.
+    """
+    stmt = (
+        select(
+            SmsRecipient.id,
+            SmsRecipient.phone,
+            SmsRecipient.attempts,
+            func.coalesce(ReminderModel.subject, ReminderArchive.subject).label("subject"),
+            func.coalesce(ReminderModel.message, ReminderArchive.message).label("message"),
+            ElderlyModel.name.label("elderly_name"),
+        )
+        .outerjoin(ReminderModel, ReminderModel.id == SmsRecipient.reminder_id)
+        .outerjoin(ReminderArchive, ReminderArchive.id == SmsRecipient.reminder_id)
+        .join(ElderlyModel, ElderlyModel.id == SmsRecipient.elderly_id)
+        .where(
+            SmsRecipient.status == SmsStatus.pending,
+            or_(SmsRecipient.next_attempt_at.is_(None), SmsRecipient.next_attempt_at <= (now or datetime.now())),
+        )
+        .order_by(SmsRecipient.id)
+        .limit(batch_size)
+        .with_for_update(of=SmsRecipient, skip_locked=True)
+    )
+    return db.execute(stmt).all()
+
+
+def _send_row(row):
+    if row.subject is None:
+        return None, DeliveryFailure("Reminder no longer exists", retryable=False)
+    body = sms_service.format_body(row.elderly_name, row.subject, row.message)
+    sent = {}
+
+    def send():
+        sent["provider_id"] = sms_service.transport.send(row.phone, body)
+
+    failure = sms_service.delivery.deliver(send)
+    return sent.get("provider_id"), failure
+
+
+def send_sms_rows(rows, executor: ThreadPoolExecutor):
+    """
+    Text a batch of recipients concurrently, paced by the SMS rate limiter.
+    Returns (row, provider_id, failure) triples, with failure None when sent.
+    """
+    return [(row, provider_id, failure) for row, (provider_id, failure) in zip(rows, executor.map(_send_row, rows))]
+
+
+def record_sms_outcome(db: Session, outcomes, now: datetime = None):
+    """
+    Record the status of every recipient in a batch, with one executemany
+    UPDATE per outcome (sent, to retry, deferred, failed).
+    Returns how many were sent, put back for a retry and failed.
+    """
+    now = now or datetime.now()
+    sent, retries, deferred, failed = [], [], [], []
+    for row, provider_id, failure in outcomes:
+        if failure is None:
+            sent.append({"id": row.id, "attempts": row.attempts + 1, "provider_id": provider_id})
+            continue
+        if failure.deferred:
+            deferred.append({"id": row.id, "next_attempt_at": now + timedelta(seconds=failure.retry_after)})
+            continue
+        attempts = row.attempts + 1
+        delay = sms_service.delivery.retry_delay(attempts, failure)
+        if delay is None:
+            failed.append({"id": row.id, "attempts": attempts, "last_error": failure.error})
+        else:
+            retries.append({
+                "id": row.id, "attempts": attempts, "last_error": failure.error,
+                "next_attempt_at": now + timedelta(seconds=delay),
+            })
+
+    if sent:
+        db.execute(update(SmsRecipient).values(status=SmsStatus.sent, sent_at=now, next_attempt_at=None), sent)
+    if retries:
+        db.execute(update(SmsRecipient), retries)
+    if deferred:
+        db.execute(update(SmsRecipient), deferred)
+    if failed:
+        db.execute(update(SmsRecipient).values(status=SmsStatus.failed, next_attempt_at=None), failed)
+    return len(sent), len(retries) + len(deferred), len(failed)
+
+
+def process_sms_batch(db: Session, executor: ThreadPoolExecutor, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Claim, text and record one batch of SMS recipients. Returns the batch size.
+    """
+    try:
+        now = datetime.now()
+        rows = claim_sms_batch(db, batch_size, now)
+        if not rows:
+            db.commit()
+            return 0
+        sent, retried, failed = record_sms_outcome(db, send_sms_rows(rows, executor))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"Processed SMS batch: {sent} sent, {retried} to retry, {failed} failed")
+    return len(rows)
@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+from app.services.delivery import AdaptiveRateLimiter, DeliveryController, DeliveryFailure, MAX_ERROR_LENGTH
+from app.services.sms_transport import SmsSendError, SmsTransport, load_transport
+import logging
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# E.164 allows at most 15 digits after the +
+PHONE_DIGITS = re.compile(r"^\+?\d{8,15}$")
+
+
+def classify_sms_error(error: Exception) -> DeliveryFailure:
+    """
+    Transports report their errors as SmsSendError; anything else is
+    transient if it is a connection error, permanent otherwise
+    """
+    text = f"{type(error).__name__}: {str(error)}"[:MAX_ERROR_LENGTH]
+    if isinstance(error, SmsSendError):
+        return DeliveryFailure(text, retryable=error.retryable, throttled=error.throttled)
+    return DeliveryFailure(text, retryable=isinstance(error, OSError))
+
+
+class SmsService:
+    def __init__(self):
+        self.enabled = os.getenv("SMS_ENABLED", "False").lower() in ("1", "true", "yes")
+        self.transport_name = os.getenv("SMS_TRANSPORT", "twilio")
+        self.account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
+        self.auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
+        self.from_number = os.getenv("TWILIO_FROM_NUMBER", "")
+        # Prefix for numbers stored without a country code
+        self.default_country_code = os.getenv("SMS_DEFAULT_COUNTRY_CODE", "55")
+        self.max_length = int(os.getenv("SMS_MAX_LENGTH", "320"))
+
+        # Carriers and Twilio cap the send rate per sending number
+        self.delivery = DeliveryController(
+            AdaptiveRateLimiter(
+                max_rate=float(os.getenv("SMS_RATE_LIMIT", "1")),
+                min_rate=float(os.getenv("SMS_RATE_LIMIT_MIN", "0.1")),
+                pause=float(os.getenv("SMS_THROTTLE_PAUSE", "30")),
+                name="SMS",
+            ),
+            max_attempts=int(os.getenv("SMS_MAX_ATTEMPTS", "3")),
+            retry_base_delay=float(os.getenv("SMS_RETRY_BASE_DELAY", "60")),
+            retry_max_delay=float(os.getenv("SMS_RETRY_MAX_DELAY", "3600")),
+            max_wait=float(os.getenv("SMS_RATE_MAX_WAIT", "10")),
+            classify=classify_sms_error,
+        )
+
+        self._transport = None
+        self._lock = threading.Lock()
+
+    @property
+    def transport(self) -> SmsTransport:
+        """
+        The configured transport, built on first use so that processes which
+        only record recipients never load the provider's SDK
+        """
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = load_transport(
+                        self.transport_name, self.account_sid, self.auth_token, self.from_number
+                    )
+                    logger.info(f"Using SMS transport {type(self._transport).__name__}")
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: SmsTransport):
+        self._transport = transport
+
+    def normalize_phone(self, phone: Optional[str]) -> Optional[str]:
+        """
+        Normalize a stored phone number to E.164 (+5511912345678), or None
+        when it is missing or not a plausible number. Formatting characters
+        are dropped, a 00 international prefix becomes +, and numbers
+        without a country code get the default one (after any leading
+        trunk 0).
+        """
+        if not phone:
+            return None
+        number = re.sub(r"[^\d+]", "", phone)
+        if number.startswith("00"):
+            number = "+" + number[2:]
+        elif not number.startswith("+"):
+            number = f"+{self.default_country_code}{number.lstrip('0')}"
+        return number if PHONE_DIGITS.match(number) and number.count("+") == 1 else None
+
+    def format_body(self, elderly_name: str, subject: str, message: str) -> str:
+        """
+        Text of a reminder SMS, cut to max_length characters
+        """
+        body = f"{subject} ({elderly_name}): {' '.join(message.split())}"
+        if len(body) > self.max_length:
+            body = body[:self.max_length - 3].rstrip() + "..."
+        return body
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+
+# Create a singleton instance
+sms_service = SmsService()
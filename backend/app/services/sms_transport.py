@@ -0,0 +1,94 @@
+import importlib
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SmsSendError(Exception):
+    """Raised by a transport when a text could not be sent"""
+
+    def __init__(self, message, retryable=True, throttled=False):
+        super().__init__(message)
+        self.retryable = retryable
+        self.throttled = throttled
+
+
+class SmsTransport:
+    """
+    Sends one text message. send() returns the provider's message ID or
+    raises SmsSendError. Transports are shared by the SMS worker's threads.
+    """
+
+    def send(self, to: str, body: str) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class TwilioTransport(SmsTransport):
+    """
+    Twilio Programmable Messaging. The client keeps an HTTP session, so
+    connections are reused across messages.
+    """
+
+    def __init__(self, account_sid: str, auth_token: str, from_number: str):
+        # Imported here so the API and the email worker do not load the Twilio SDK
+        from twilio.rest import Client
+
+        self.client = Client(account_sid, auth_token)
+        self.from_number = from_number
+
+    def send(self, to: str, body: str) -> str:
+        from twilio.base.exceptions import TwilioRestException
+
+        try:
+            return self.client.messages.create(to=to, from_=self.from_number, body=body).sid
+        except TwilioRestException as e:
+            # 429 is Twilio's rate limit; 5xx are its own errors; other 4xx are about the message
+            raise SmsSendError(
+                f"Twilio {e.status} (code {e.code}): {e.msg}",
+                retryable=e.status == 429 or e.status >= 500,
+                throttled=e.status == 429,
+            )
+        except OSError as e:
+            raise SmsSendError(f"Twilio request failed: {str(e)}")
+
+
+class FakeTransport(SmsTransport):
+    """
+    In-memory stand-in for tests and benchmarks. Sleeps `latency` seconds
+    per message and fails a `failure_rate` share of them (retryably).
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.sent = []  # (to, body, message ID)
+        self._lock = threading.Lock()
+
+    def send(self, to: str, body: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise SmsSendError("Fake transport failure")
+        with self._lock:
+            message_id = f"FAKE{len(self.sent) + 1:08d}"
+            self.sent.append((to, body, message_id))
+        return message_id
+
+
+def load_transport(name: str, account_sid: str = "", auth_token: str = "", from_number: str = "") -> SmsTransport:
+    """
+    Build a transport by name: "twilio" (with the account credentials),
+    "fake", or "module:Class" for a custom one taking no arguments
+    """
+    if name == "twilio":
+        return TwilioTransport(account_sid, auth_token, from_number)
+    if name == "fake":
+        return FakeTransport()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,182 @@
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPoolTimeout(Exception):
+    """Raised when no SMTP session becomes available within the timeout"""
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated, reusable SMTP sessions.
+
+    Sessions are handed out LIFO so that a small steady load keeps reusing the
+    same warm connections while the rest age out through idle eviction.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        username="",
+        password="",
+        max_size=5,
+        use_tls=True,
+        timeout=30,
+        acquire_timeout=30,
+        idle_timeout=60,
+        health_check_interval=15,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_size = max_size
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # (session, last_used)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._closed = False
+
+    def _connect(self):
+        """
+        Open, secure and authenticate a new SMTP session
+        """
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+        logger.debug(f"Opened SMTP session to {self.host}:{self.port}")
+        return server
+
+    @staticmethod
+    def _close_quietly(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_alive(server):
+        try:
+            code, _ = server.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(server):
+        try:
+            code, _ = server.rset()
+            return code == 250
+        except Exception:
+            return False
+
+    def _evict_idle(self):
+        """
+        Close sessions that have been idle for longer than idle_timeout
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            # The oldest sessions sit at the left end of the deque
+            while self._idle and now - self._idle[0][1] > self.idle_timeout:
+                stale.append(self._idle.popleft()[0])
+        for server in stale:
+            self._close_quietly(server)
+        if stale:
+            logger.debug(f"Evicted {len(stale)} idle SMTP sessions")
+
+    def acquire(self):
+        """
+        Borrow a healthy session, opening a new one if none is idle
+        """
+        if self._closed:
+            raise RuntimeError("SMTP pool is closed")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise SMTPPoolTimeout(f"No SMTP session available after {self.acquire_timeout}s")
+
+        try:
+            self._evict_idle()
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    return self._connect()
+
+                server, last_used = entry
+                # Only ping sessions that have been sitting around for a while
+                if time.monotonic() - last_used < self.health_check_interval or self._is_alive(server):
+                    return server
+                logger.debug("Discarding unhealthy SMTP session")
+                self._close_quietly(server)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server, discard=False):
+        """
+        Return a session to the pool, or close it if it is broken
+        """
+        try:
+            if discard or self._closed:
+                self._close_quietly(server)
+            else:
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that borrows a session and returns it afterwards.
+        Sessions are kept after a per-message rejection if they still accept
+        RSET, and discarded after any other error.
+        """
+        server = self.acquire()
+        discard = False
+        try:
+            yield server
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            discard = not self._reset(server)
+            raise
+        except Exception:
+            discard = True
+            raise
+        finally:
+            self.release(server, discard=discard)
+
+    def close(self):
+        """
+        Close every idle session and refuse further borrowing
+        """
+        self._closed = True
+        with self._lock:
+            idle = [server for server, _ in self._idle]
+            self._idle.clear()
+        for server in idle:
+            self._close_quietly(server)
+
+    def stats(self):
+        with self._lock:
+            return {"max_size": self.max_size, "idle": len(self._idle)}
@@ -0,0 +1,77 @@
+from typing import Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import Table, select, update, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# INSERT constructs with ON CONFLICT support, for each backend app.database accepts
+CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Compare-and-set attempts on databases without UPDATE ... FROM ... RETURNING
+MAX_ATTEMPTS = 3
+
+
+def update_returning(
+    db: Session,
+    table: Table,
+    row_id: int,
+    changes: dict,
+    returning: Sequence,
+    previous: Sequence = (),
+    shared: Sequence = (),
+    onclause=None,
+) -> Optional[dict]:
+    """
+    UPDATE one row by ID and return its `returning` columns, or None when no
+    row has that ID. updated_at is set by the database.
+
+    `previous` columns are returned too, as `old_<name>`, with the values the
+    update replaced. `shared` columns of another table, joined on `onclause`,
+    are returned under their own names and that row is locked FOR SHARE
+    until the transaction ends.
+
+    On PostgreSQL this is a single UPDATE ... FROM (SELECT ... FOR NO KEY
+    UPDATE) ... RETURNING. Elsewhere (SQLite) the previous values are read
+    first and the UPDATE only matches the row while it still has them
+    (compare-and-set), retried up to MAX_ATTEMPTS times before a 409.
+    """
+    stmt = update(table).values(updated_at=func.current_date(), **changes)
+    if not previous and not shared:
+        row = db.execute(stmt.where(table.c.id == row_id).returning(*returning)).first()
+        return dict(row._mapping) if row else None
+
+    before = select(table.c.id, *(column.label(f"old_{column.key}") for column in previous), *shared)
+    before = (before.join_from(table, shared[0].table, onclause) if shared else before).where(table.c.id == row_id)
+
+    if db.get_bind().dialect.name == "postgresql":
+        before = before.with_for_update(of=table, key_share=True)
+        if shared:
+            before = before.suffix_with(f"FOR SHARE OF {shared[0].table.name}")
+        old = before.subquery("old")
+        row = db.execute(
+            stmt.where(table.c.id == old.c.id)
+            .returning(*returning, *(column for column in old.c if column.key != "id"))
+        ).first()
+        return dict(row._mapping) if row else None
+
+    stmt = stmt.where(table.c.id == row_id).returning(*returning)
+    for _ in range(MAX_ATTEMPTS):
+        values = db.execute(before).first()
+        if values is None:
+            return None
+        unchanged = [table.c[column.key].is_not_distinct_from(old) for column, old in zip(previous, values[1:])]
+        row = db.execute(stmt.where(*unchanged)).first()
+        if row is not None:
+            return {**row._mapping, **{key: value for key, value in values._mapping.items() if key != "id"}}
+    raise HTTPException(status_code=409, detail="The record changed during the update, please retry")
+
+
+def insert_on_conflict(db: Session, target):
+    """
+    An INSERT into target for the session's database, with on_conflict_do_nothing
+    and on_conflict_do_update
+    """
+    return CONFLICT_INSERTS[db.get_bind().dialect.name](target)
@@ -0,0 +1,109 @@
+"""
+Reminder delivery worker.
+
+Claims queued reminders from the database and delivers them, by email or,
+with --channel sms, as text messages to their SMS recipients. Several worker
+processes can run side by side; each one claims a disjoint batch.
+
+Usage (from the backend directory):
+
+    python -m app.worker
+    python -m app.worker --concurrency 16 --batch-size 500
+    python -m app.worker --once
+    python -m app.worker --digest
+    python -m app.worker --channel sms
+"""
+import argparse
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from app.database import SessionLocal
+from app.services.email_service import email_service
+from app.services.delivery import delivery_controller
+from app.services.reminder_dispatch import process_batch
+from app.services.sms_service import sms_service
+from app.services.sms_dispatch import process_sms_batch
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderWorker:
+    def __init__(self, concurrency: int, batch_size: int, poll_interval: float, digest: bool = False,
+                 channel: str = "email"):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.digest = digest
+        self.channel = channel
+        self._running = True
+
+    def stop(self, *args):
+        logger.info("Stopping reminder worker after the current batch")
+        self._running = False
+
+    def run(self, once: bool = False):
+        """
+        Process batches until stopped. With once=True, drain the queue and exit.
+        """
+        delivery = sms_service.delivery if self.channel == "sms" else delivery_controller
+        logger.info(
+            f"Reminder worker started (channel={self.channel}, concurrency={self.concurrency}, "
+            f"batch_size={self.batch_size}, digest={self.digest}, rate_limit={delivery.limiter.max_rate}/s, "
+            f"max_attempts={delivery.max_attempts})"
+        )
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while self._running:
+                db = SessionLocal()
+                try:
+                    if self.channel == "sms":
+                        claimed = process_sms_batch(db, executor, self.batch_size)
+                    else:
+                        claimed = process_batch(db, executor, self.batch_size, self.digest)
+                except Exception as e:
+                    logger.error(f"Error processing reminder batch: {str(e)}")
+                    claimed = 0
+                finally:
+                    db.close()
+
+                if claimed:
+                    continue
+                if once:
+                    break
+                time.sleep(self.poll_interval)
+        email_service.pool.close()
+        sms_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int,
+                        default=int(os.getenv("REMINDER_WORKER_CONCURRENCY", str(email_service.pool.max_size))))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("REMINDER_WORKER_BATCH_SIZE", "200")))
+    parser.add_argument("--poll-interval", type=float,
+                        default=float(os.getenv("REMINDER_WORKER_POLL_INTERVAL", "5")))
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    parser.add_argument("--digest", action="store_true",
+                        default=os.getenv("REMINDER_DIGEST", "False").lower() in ("1", "true", "yes"),
+                        help="Send one combined email per recipient instead of one per reminder")
+    parser.add_argument("--channel", choices=("email", "sms"), default="email",
+                        help="Deliver reminder emails, or text the SMS recipients of queued reminders")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+
+    worker = ReminderWorker(args.concurrency, args.batch_size, args.poll_interval, args.digest, args.channel)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
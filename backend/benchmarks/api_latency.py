@@ -0,0 +1,369 @@
+"""
+API latency and throughput benchmark.
+
+Seeds a local database (see benchmarks.seed), then drives the real FastAPI
+application in-process through its ASGI stack at a fixed concurrency and
+reports p50/p95/p99 latency and throughput for every endpoint under
+app/routes as JSON. SMTP delivery is stubbed out.
+
+Usage (from the backend directory):
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.api_latency --elderly 10000 --concurrency 20 --requests 500 --output bench.json
+
+Point --database-url at a local PostgreSQL database to benchmark against it;
+it is dropped and reseeded unless --skip-seed is given. Use --app
+app.main_async:app to measure the async stack instead.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import math
+import os
+import platform
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks import seed
+
+
+class Context:
+    """
+    Shared state of a run: the seeded IDs and the IDs created by the
+    benchmark's own POST requests, consumed by the matching DELETEs
+    """
+
+    def __init__(self, rng, elderly_ids, recommendation_ids, reminder_ids, archived_reminder_ids, series_ids):
+        self.rng = rng
+        self.elderly_ids = elderly_ids
+        self.recommendation_ids = recommendation_ids
+        self.reminder_ids = reminder_ids
+        self.archived_reminder_ids = archived_reminder_ids
+        self.series_ids = series_ids
+        self.created = {"elderly": [], "recommendations": [], "reminders": [], "reminder-series": []}
+
+    def elderly_id(self):
+        return self.rng.choice(self.elderly_ids)
+
+    def recommendation_id(self):
+        return self.rng.choice(self.recommendation_ids)
+
+    def reminder_id(self):
+        return self.rng.choice(self.reminder_ids)
+
+    def archived_reminder_id(self):
+        return self.rng.choice(self.archived_reminder_ids)
+
+    def series_id(self):
+        return self.rng.choice(self.series_ids)
+
+    def pop_created(self, namespace):
+        return self.created[namespace].pop() if self.created[namespace] else None
+
+
+def _elderly_body(ctx):
+    return {"name": "Pessoa Benchmark", "age": ctx.rng.randint(60, 100), "responsible_person": "Responsavel"}
+
+
+def _recommendation_body(ctx):
+    return {
+        "elderly_id": ctx.elderly_id(),
+        "week": ctx.rng.randint(1, 16),
+        "category": ctx.rng.choice(seed.CATEGORIES),
+        "content": "Caminhada leve de 20 minutos",
+    }
+
+
+def _reminder_body(ctx):
+    return {
+        "elderly_id": ctx.elderly_id(),
+        "scheduled_date": date.today().isoformat(),
+        "email": "familia@example.com",
+        "subject": "Lembrete",
+        "message": "Tomar a medicacao apos o almoco.",
+    }
+
+
+def _series_body(ctx):
+    return {
+        **_reminder_body(ctx),
+        "rrule": "FREQ=WEEKLY;COUNT=16",
+        "dtstart": (date.today() + timedelta(days=1)).isoformat(),
+    }
+
+
+def _created(namespace):
+    def collect(ctx, response):
+        ctx.created[namespace].append(response.json()["id"])
+    return collect
+
+
+def _delete_created(namespace):
+    def build(ctx):
+        created_id = ctx.pop_created(namespace)
+        return created_id and ("DELETE", f"/api/{namespace}/{created_id}", None)
+    return build
+
+
+def scenarios():
+    """
+    One scenario per endpoint, and per filter with its own query path:
+    (name, build(ctx) -> (method, url, json body) or None, on_success).
+    POST scenarios run before the DELETE scenarios that consume what they created.
+    Every route under app/routes must have one here.
+    """
+    return [
+        # Elderly
+        ("GET /api/elderly/",
+         lambda ctx: ("GET", f"/api/elderly/?skip={ctx.rng.randrange(len(ctx.elderly_ids))}&limit=100", None), None),
+        ("GET /api/elderly/{elderly_id}",
+         lambda ctx: ("GET", f"/api/elderly/{ctx.elderly_id()}", None), None),
+        ("POST /api/elderly/",
+         lambda ctx: ("POST", "/api/elderly/", _elderly_body(ctx)), _created("elderly")),
+        ("PUT /api/elderly/{elderly_id}",
+         lambda ctx: ("PUT", f"/api/elderly/{ctx.elderly_id()}",
+                      {"risk_level": ctx.rng.choice(seed.RISK_LEVELS)}), None),
+        ("DELETE /api/elderly/{elderly_id}",
+         _delete_created("elderly"), None),
+        # Recommendations
+        ("GET /api/recommendations/",
+         lambda ctx: ("GET", f"/api/recommendations/?elderly_id={ctx.elderly_id()}", None), None),
+        ("GET /api/recommendations/ (week filter)",
+         lambda ctx: ("GET", f"/api/recommendations/?week={ctx.rng.randint(1, 16)}&limit=100", None), None),
+        ("GET /api/recommendations/{recommendation_id}",
+         lambda ctx: ("GET", f"/api/recommendations/{ctx.recommendation_id()}", None), None),
+        ("GET /api/recommendations/export",
+         lambda ctx: ("GET", f"/api/recommendations/export?elderly_id={ctx.elderly_id()}", None), None),
+        ("POST /api/recommendations/",
+         lambda ctx: ("POST", "/api/recommendations/", _recommendation_body(ctx)), _created("recommendations")),
+        ("POST /api/recommendations/bulk",
+         lambda ctx: ("POST", "/api/recommendations/bulk",
+                      {"items": [_recommendation_body(ctx) for _ in range(100)]}), None),
+        ("PUT /api/recommendations/{recommendation_id}",
+         lambda ctx: ("PUT", f"/api/recommendations/{ctx.recommendation_id()}",
+                      {"content": "Caminhada moderada de 30 minutos"}), None),
+        ("PATCH /api/recommendations/{recommendation_id}/adherence",
+         lambda ctx: ("PATCH", f"/api/recommendations/{ctx.recommendation_id()}/adherence",
+                      {"adherence": ctx.rng.choice(["full", "partial", "none"])}), None),
+        ("DELETE /api/recommendations/{recommendation_id}",
+         _delete_created("recommendations"), None),
+        # Reminders
+        ("GET /api/reminders/",
+         lambda ctx: ("GET", f"/api/reminders/?elderly_id={ctx.elderly_id()}", None), None),
+        ("GET /api/reminders/ (unsent)",
+         lambda ctx: ("GET", "/api/reminders/?sent=false&limit=100", None), None),
+        ("GET /api/reminders/ (dead letter)",
+         lambda ctx: ("GET", "/api/reminders/?dead_letter=true&limit=100", None), None),
+        ("GET /api/reminders/ (include archived)",
+         lambda ctx: ("GET", f"/api/reminders/?elderly_id={ctx.elderly_id()}&include_archived=true", None), None),
+        ("GET /api/reminders/{reminder_id}",
+         lambda ctx: ("GET", f"/api/reminders/{ctx.reminder_id()}", None), None),
+        ("GET /api/reminders/{reminder_id} (archived)",
+         lambda ctx: ("GET", f"/api/reminders/{ctx.archived_reminder_id()}?include_archived=true", None), None),
+        ("POST /api/reminders/",
+         lambda ctx: ("POST", "/api/reminders/", _reminder_body(ctx)), _created("reminders")),
+        ("PUT /api/reminders/{reminder_id}",
+         lambda ctx: ("PUT", f"/api/reminders/{ctx.reminder_id()}", {"subject": "Lembrete atualizado"}), None),
+        ("POST /api/reminders/{reminder_id}/send",
+         lambda ctx: ("POST", f"/api/reminders/{ctx.reminder_id()}/send", None), None),
+        ("POST /api/reminders/send-due",
+         lambda ctx: ("POST", "/api/reminders/send-due", None), None),
+        ("DELETE /api/reminders/{reminder_id}",
+         _delete_created("reminders"), None),
+        # Reminder series
+        ("GET /api/reminder-series/",
+         lambda ctx: ("GET", f"/api/reminder-series/?elderly_id={ctx.elderly_id()}", None), None),
+        ("GET /api/reminder-series/ (active)",
+         lambda ctx: ("GET", "/api/reminder-series/?active=true&limit=100", None), None),
+        ("GET /api/reminder-series/{series_id}",
+         lambda ctx: ("GET", f"/api/reminder-series/{ctx.series_id()}", None), None),
+        ("GET /api/reminder-series/{series_id}/occurrences",
+         lambda ctx: ("GET", f"/api/reminder-series/{ctx.series_id()}/occurrences", None), None),
+        ("POST /api/reminder-series/",
+         lambda ctx: ("POST", "/api/reminder-series/", _series_body(ctx)), _created("reminder-series")),
+        ("PUT /api/reminder-series/{series_id}",
+         lambda ctx: ("PUT", f"/api/reminder-series/{ctx.series_id()}", {"subject": "Lembrete atualizado"}), None),
+        ("DELETE /api/reminder-series/{series_id}",
+         _delete_created("reminder-series"), None),
+        # SMS
+        ("GET /api/sms/recipients",
+         lambda ctx: ("GET", f"/api/sms/recipients?elderly_id={ctx.elderly_id()}", None), None),
+        ("GET /api/sms/recipients (status filter)",
+         lambda ctx: ("GET", "/api/sms/recipients?status=sent&limit=100", None), None),
+        # Analytics and metrics
+        ("GET /api/analytics/adherence",
+         lambda ctx: ("GET", "/api/analytics/adherence?group_by=week&group_by=risk_level", None), None),
+        ("GET /api/metrics/cache", lambda ctx: ("GET", "/api/metrics/cache", None), None),
+        ("GET /api/metrics/db", lambda ctx: ("GET", "/api/metrics/db", None), None),
+    ]
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(client, ctx, scenario, requests, concurrency, warmup):
+    name, build, on_success = scenario
+    latencies = []
+    errors = 0
+    statuses = {}
+
+    async def send(record):
+        nonlocal errors
+        request = build(ctx)
+        if not request:
+            return False
+        method, url, body = request
+        start = time.perf_counter()
+        response = await client.request(method, url, json=body)
+        elapsed = time.perf_counter() - start
+        if record:
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+        if response.status_code < 400 and on_success:
+            on_success(ctx, response)
+        return True
+
+    for _ in range(warmup):
+        await send(record=False)
+
+    pending = iter(range(requests))
+
+    async def worker():
+        for _ in pending:
+            if not await send(record=True):
+                break
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    to_ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None  # noqa: E731
+    return {
+        "endpoint": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": to_ms(percentile(latencies, 50)),
+        "p95_ms": to_ms(percentile(latencies, 95)),
+        "p99_ms": to_ms(percentile(latencies, 99)),
+        "mean_ms": to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        "max_ms": to_ms(latencies[-1]) if latencies else None,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed and latencies else None,
+    }
+
+
+def _stub_smtp():
+    """
+    Make every email "succeed" without opening a connection
+    """
+    from app.services.email_service import EmailService
+    EmailService.send_email = lambda self, to_email, subject, message, text=None, raise_errors=False: True
+
+
+def _load_app(path):
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+async def run(app, args):
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models import Elderly, Recommendation, Reminder, ReminderArchive, ReminderSeries
+
+    db = SessionLocal()
+    try:
+        ctx = Context(
+            random.Random(args.random_seed),
+            db.scalars(select(Elderly.id)).all(),
+            db.scalars(select(Recommendation.id)).all(),
+            db.scalars(select(Reminder.id)).all(),
+            db.scalars(select(ReminderArchive.id)).all(),
+            db.scalars(select(ReminderSeries.id)).all(),
+        )
+    finally:
+        db.close()
+
+    selected = [s for s in scenarios() if not args.endpoint or any(f in s[0] for f in args.endpoint)]
+    # Server errors are reported per endpoint rather than aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in selected:
+            results.append(await run_scenario(client, ctx, scenario, args.requests, args.concurrency, args.warmup))
+            logging.getLogger("benchmarks").warning(f"{scenario[0]}: p50 {results[-1]['p50_ms']} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    seed.add_arguments(parser)
+    parser.add_argument("--app", default="app.main:app", help="ASGI application to benchmark")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--endpoint", action="append", help="only run endpoints whose name contains this")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the existing database contents")
+    parser.add_argument("--no-cache", action="store_true", help="disable the read cache")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Configure the app before it is first imported
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["CACHE_ENABLED"] = "False" if args.no_cache else os.getenv("CACHE_ENABLED", "True")
+    _stub_smtp()
+
+    population = None
+    if not args.skip_seed:
+        population = seed.seed_database(args.elderly, args.weeks, args.recommendations_per_week, args.reminders,
+                                        seed=args.random_seed)
+
+    app = _load_app(args.app)
+    # Per-request INFO logs and slow request warnings would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app.request_metrics").setLevel(logging.ERROR)
+
+    import sqlalchemy
+    from app.database import engine
+    from app.cache import read_cache
+    results = asyncio.run(run(app, args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "app": args.app,
+            "database": engine.dialect.name,
+            "population": population,
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "warmup_per_endpoint": args.warmup,
+            "cache_enabled": read_cache.enabled,
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Email rendering benchmark.
+
+Builds reminder and digest emails without sending them, and reports
+messages/sec for rendering the templates alone and for rendering plus
+building and serializing the MIME message (everything a send does before
+SMTP). The old inline f-string reminder is measured as a baseline.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.email_rendering --messages 20000 --digest-size 5
+"""
+import argparse
+import json
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from app.services.email_service import EmailService
+
+
+def _legacy_reminder(from_header, to_email, elderly_name, subject, message):
+    html = f"""
+    <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background-color: #1976d2; color: white; padding: 10px; text-align: center; }}
+                .content {{ padding: 20px; background-color: #f9f9f9; }}
+                .footer {{ text-align: center; margin-top: 20px; font-size: 12px; color: #777; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h2>Lembrete de Acompanhamento</h2>
+                </div>
+                <div class="content">
+                    <p>Olá,</p>
+                    <p>Este é um lembrete para o acompanhamento de <strong>{elderly_name}</strong>.</p>
+                    <p>{message}</p>
+                    <p>Obrigado por seu trabalho no cuidado aos idosos!</p>
+                </div>
+                <div class="footer">
+                    <p>Este é um email automático. Por favor, não responda.</p>
+                    <p>© Elderly Care System</p>
+                </div>
+            </div>
+        </body>
+    </html>
+    """
+    msg = MIMEMultipart()
+    msg["From"] = from_header
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(html, "html"))
+    return msg.as_bytes()
+
+
+def _run(label, func, count):
+    func(0)  # Compile and cache the templates outside the timing
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": label,
+        "messages": count,
+        "seconds": round(elapsed, 4),
+        "messages_per_sec": round(count / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--digest-size", type=int, default=5, help="Reminders per digest email")
+    parser.add_argument("--locale", default=None)
+    args = parser.parse_args()
+
+    service = EmailService()
+    locale = args.locale or service.locale
+    message = "Lembre-se da caminhada de 30 minutos hoje & beba água <3"
+    digest = [(f"Pessoa {n}", f"Acompanhamento {n}", message) for n in range(args.digest_size)]
+
+    def reminder(i):
+        return service.templates.render("reminder", locale, elderly_name=f"Maria {i}", message=message)
+
+    def digest_email(i):
+        return service.templates.render(
+            "digest", locale,
+            reminders=[{"elderly_name": name, "subject": subject, "message": body} for name, subject, body in digest],
+        )
+
+    def build_reminder(i):
+        rendered = reminder(i)
+        return service.build_message(f"user{i}@example.com", "Lembrete", rendered.html, rendered.text).as_bytes()
+
+    def build_digest(i):
+        rendered = digest_email(i)
+        return service.build_message(f"user{i}@example.com", rendered.subject, rendered.html, rendered.text).as_bytes()
+
+    results = [
+        _run("legacy reminder (f-string + MIME)",
+             lambda i: _legacy_reminder(service.from_header, f"user{i}@example.com", f"Maria {i}", "Lembrete", message),
+             args.messages),
+        _run("reminder render", reminder, args.messages),
+        _run("reminder render + MIME", build_reminder, args.messages),
+        _run(f"digest of {args.digest_size} render", digest_email, args.messages),
+        _run(f"digest of {args.digest_size} render + MIME", build_digest, args.messages),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Synthetic population for the API benchmarks.
+
+Creates the schema and fills it with elderly people, a recommendation per
+week (and category, with --recommendations-per-week > 1) for each of them
+and a handful of reminders, some due and some in the future. Each person
+also gets a weekly reminder series starting tomorrow, a sent reminder that
+is moved to the archive with its SMS recipients, and one in ten of the due
+reminders is dead-lettered.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.seed --database-url sqlite:///./benchmarks/bench.db --elderly 10000
+
+The database URL defaults to DATABASE_URL, or a local SQLite file when unset.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmarks/bench.db"
+
+# Rows per INSERT round trip
+CHUNK_SIZE = 5000
+
+RISK_LEVELS = ("baixo", "medio", "alto")
+CATEGORIES = ("exercicio", "alimentacao", "medicacao", "social")
+ADHERENCE = ("full", "partial", "none", None)
+
+# Share of the due reminders whose delivery failed for good
+DEAD_LETTER_RATIO = 0.1
+
+
+def _insert(conn, table, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        conn.execute(table.insert(), rows[start:start + CHUNK_SIZE])
+
+
+def seed_database(elderly=10000, weeks=16, recommendations_per_week=1, reminders=4, reset=True, seed=42):
+    """
+    Populate the database configured in app.database and return row counts.
+    DATABASE_URL must be set before the app is first imported.
+    """
+    from sqlalchemy import select, text
+    from app.database import engine, Base, SessionLocal
+    from app.models import Elderly, Recommendation, Reminder, ReminderSeries, SmsRecipient
+    from app.services import adherence_summary
+    from app.services.reminder_archive import archive_sent_reminders
+
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.now()
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        # Let readers run alongside the single writer (persists in the database file)
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL"))
+
+    with engine.begin() as conn:
+        _insert(conn, Elderly.__table__, [
+            {
+                "name": f"Pessoa {i}",
+                "age": rng.randint(60, 100),
+                "current_week": rng.randint(1, weeks),
+                "start_date": today - timedelta(weeks=weeks),
+                "risk_level": rng.choice(RISK_LEVELS),
+                "phone": f"+55119{i:08d}",
+                "caregiver_phone": f"+55118{i:08d}",
+                "responsible_person": f"Responsavel {i}",
+                "health_conditions": "Hipertensao controlada; diabetes tipo 2",
+                "observations": "Gerado para benchmark",
+                "created_at": today,
+                "updated_at": today,
+            }
+            for i in range(elderly)
+        ])
+        elderly_ids = conn.scalars(select(Elderly.id).order_by(Elderly.id)).all()[-elderly:]
+
+        recommendation_rows = []
+        reminder_rows = []
+        series_rows = []
+        for elderly_id in elderly_ids:
+            for week in range(1, weeks + 1):
+                for category in rng.sample(CATEGORIES, recommendations_per_week):
+                    recommendation_rows.append({
+                        "elderly_id": elderly_id,
+                        "week": week,
+                        "date": today - timedelta(weeks=weeks - week),
+                        "category": category,
+                        "content": f"Recomendacao de {category} para a semana {week}",
+                        "adherence": rng.choice(ADHERENCE),
+                        "created_at": today,
+                        "updated_at": today,
+                    })
+            for _ in range(reminders):
+                scheduled_date = today + timedelta(days=rng.randint(-7, 30))
+                dead = scheduled_date <= today and rng.random() < DEAD_LETTER_RATIO
+                reminder_rows.append({
+                    "elderly_id": elderly_id,
+                    "scheduled_date": scheduled_date,
+                    "email": f"familia{elderly_id}@example.com",
+                    "subject": "Lembrete semanal",
+                    "message": "Nao esqueca a caminhada de 30 minutos hoje.",
+                    "sent": False,
+                    "sent_at": None,
+                    "attempts": 3 if dead else 0,
+                    "last_error": "SMTPRecipientsRefused: mailbox unavailable" if dead else None,
+                    "dead_lettered_at": now if dead else None,
+                    "created_at": today,
+                    "updated_at": today,
+                })
+            # Archived below, with the texts it was sent as
+            reminder_rows.append({
+                "elderly_id": elderly_id,
+                "scheduled_date": today - timedelta(weeks=weeks),
+                "email": f"familia{elderly_id}@example.com",
+                "subject": "Boas-vindas ao programa",
+                "message": "Bem-vindo ao programa de acompanhamento semanal.",
+                "sent": True,
+                "sent_at": today - timedelta(weeks=weeks),
+                "attempts": 1,
+                "last_error": None,
+                "dead_lettered_at": None,
+                "created_at": today - timedelta(weeks=weeks),
+                "updated_at": today - timedelta(weeks=weeks),
+            })
+            # Not due during the run, so send-due does not expand it
+            series_rows.append({
+                "elderly_id": elderly_id,
+                "email": f"familia{elderly_id}@example.com",
+                "subject": "Lembrete da semana",
+                "message": "Confira as recomendacoes desta semana.",
+                "rrule": f"FREQ=WEEKLY;COUNT={weeks}",
+                "dtstart": today + timedelta(days=1),
+                "active": True,
+                "next_occurrence": today + timedelta(days=1),
+                "created_at": today,
+                "updated_at": today,
+            })
+        _insert(conn, Recommendation.__table__, recommendation_rows)
+        _insert(conn, Reminder.__table__, reminder_rows)
+        _insert(conn, ReminderSeries.__table__, series_rows)
+
+        sent = conn.execute(select(Reminder.id, Reminder.elderly_id).where(Reminder.sent == True)).all()  # noqa: E712
+        sms_rows = [
+            {
+                "reminder_id": reminder_id,
+                "elderly_id": elderly_id,
+                "phone": f"+5511{prefix}{elderly_id:08d}",
+                "role": role,
+                "status": "sent",
+                "attempts": 1,
+                "provider_id": f"SM{reminder_id:032d}{prefix}",
+                "sent_at": now - timedelta(weeks=weeks),
+                "created_at": now - timedelta(weeks=weeks),
+            }
+            for reminder_id, elderly_id in sent
+            for prefix, role in (("9", "elderly"), ("8", "caregiver"))
+        ]
+        _insert(conn, SmsRecipient.__table__, sms_rows)
+
+    db = SessionLocal()
+    try:
+        adherence_summary.rebuild(db)
+        db.commit()
+        archived = archive_sent_reminders(db, older_than_days=0, batch_size=CHUNK_SIZE)
+    finally:
+        db.close()
+
+    return {
+        "elderly": len(elderly_ids),
+        "recommendations": len(recommendation_rows),
+        "reminders": len(reminder_rows) - archived,
+        "archived_reminders": archived,
+        "reminder_series": len(series_rows),
+        "sms_recipients": len(sms_rows),
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--elderly", type=int, default=10000)
+    parser.add_argument("--weeks", type=int, default=16)
+    parser.add_argument("--recommendations-per-week", type=int, default=1, choices=range(1, len(CATEGORIES) + 1))
+    parser.add_argument("--reminders", type=int, default=4, help="reminders per elderly person")
+    parser.add_argument("--random-seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    # The app reads DATABASE_URL when it is first imported
+    os.environ["DATABASE_URL"] = args.database_url
+    start = time.perf_counter()
+    counts = seed_database(args.elderly, args.weeks, args.recommendations_per_week, args.reminders,
+                           seed=args.random_seed)
+    print(json.dumps({**counts, "seconds": round(time.perf_counter() - start, 2)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
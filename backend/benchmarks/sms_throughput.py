@@ -0,0 +1,100 @@
+"""
+SMS throughput benchmark.
+
+Seeds a local database, queues every reminder with the SMS channel enabled
+(recording two recipients per reminder), then drains the SMS queue through
+the fake transport, which sleeps --latency seconds per message like a
+provider API call would. The drain is repeated for each worker pool size;
+statuses are recorded with one batched UPDATE per outcome.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.sms_throughput --elderly 2000 --latency 0.05 --workers 1 8 32
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from benchmarks import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", seed.DEFAULT_DATABASE_URL))
+    parser.add_argument("--elderly", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake provider call")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    # Point the app at the benchmark database before it is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import select, update, func
+    from app.database import SessionLocal
+    from app.models import SmsRecipient, SmsStatus
+    from app.services.delivery import AdaptiveRateLimiter
+    from app.services.reminder_dispatch import enqueue_due_reminders
+    from app.services.sms_dispatch import process_sms_batch
+    from app.services.sms_service import sms_service
+    from app.services.sms_transport import FakeTransport
+
+    seed.seed_database(elderly=args.elderly, weeks=1, reminders=1)
+    sms_service.enabled = True
+    # Measure the pool, not the provider's rate limit
+    sms_service.delivery.limiter = AdaptiveRateLimiter(max_rate=1e6)
+
+    db = SessionLocal()
+    try:
+        # The seed's archived reminders come with recipients that were already texted
+        seeded = db.scalar(func.coalesce(func.max(SmsRecipient.id), 0))
+        start = time.perf_counter()
+        queued = enqueue_due_reminders(db, date.today() + timedelta(days=365))
+        db.commit()
+        recipients = db.scalar(select(func.count(SmsRecipient.id)).where(SmsRecipient.id > seeded))
+    finally:
+        db.close()
+    results = [{
+        "mode": "queue reminders and record recipients",
+        "reminders": queued,
+        "recipients": recipients,
+        "seconds": round(time.perf_counter() - start, 4),
+    }]
+
+    for workers in args.workers:
+        db = SessionLocal()
+        db.execute(
+            update(SmsRecipient)
+            .where(SmsRecipient.id > seeded)
+            .values(status=SmsStatus.pending, attempts=0, next_attempt_at=None)
+        )
+        db.commit()
+        db.close()
+
+        sms_service.transport = FakeTransport(latency=args.latency)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                db = SessionLocal()
+                try:
+                    if not process_sms_batch(db, executor, args.batch_size):
+                        break
+                finally:
+                    db.close()
+        elapsed = time.perf_counter() - start
+        sent = len(sms_service.transport.sent)
+        results.append({
+            "mode": "send",
+            "workers": workers,
+            "messages": sent,
+            "seconds": round(elapsed, 4),
+            "messages_per_sec": round(sent / elapsed, 1),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+SMTP throughput benchmark.
+
+Starts a local aiosmtpd stand-in server and sends the same batch of reminder
+emails twice: once opening a fresh SMTP connection per message (the old
+behaviour) and once through the pooled EmailService.
+
+Usage (from the backend directory):
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.smtp_throughput --messages 2000 --workers 8
+"""
+import argparse
+import json
+import os
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+from aiosmtpd.controller import Controller
+
+
+class _DiscardHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 Message accepted for delivery"
+
+
+def _send_unpooled(host, port, to_email):
+    msg = MIMEText("benchmark", "html")
+    msg["From"] = "bench@localhost"
+    msg["To"] = to_email
+    msg["Subject"] = "benchmark"
+    server = smtplib.SMTP(host, port)
+    server.send_message(msg)
+    server.quit()
+    return True
+
+
+def _run(label, func, count, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(func, range(count)))
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": label,
+        "messages": count,
+        "workers": workers,
+        "failed": results.count(False),
+        "seconds": round(elapsed, 4),
+        "messages_per_sec": round(count / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    controller = Controller(_DiscardHandler(), hostname="127.0.0.1", port=args.port)
+    controller.start()
+
+    # Point the service at the stand-in server before it is imported
+    os.environ.update({
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(args.port),
+        "SMTP_USERNAME": "",
+        "SMTP_USE_TLS": "False",
+        "SMTP_POOL_SIZE": str(args.workers),
+    })
+    from app.services.email_service import EmailService
+
+    service = EmailService()
+    try:
+        results = [
+            _run("unpooled", lambda i: _send_unpooled("127.0.0.1", args.port, f"user{i}@example.com"),
+                 args.messages, args.workers),
+            _run("pooled", lambda i: service.send_reminder(f"user{i}@example.com", "Maria", "benchmark",
+                                                           "Lembrete de benchmark"),
+                 args.messages, args.workers),
+        ]
+    finally:
+        service.pool.close()
+        controller.stop()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
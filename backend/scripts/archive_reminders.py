@@ -0,0 +1,60 @@
+"""
+Move sent reminders older than a given age into the reminders_archive table.
+
+Rows are moved in small batches, each in its own short transaction, so the
+job can run next to the API and the delivery worker. When reminders is
+partitioned by month (PostgreSQL, see migration 0007), upcoming partitions
+are created and fully archived ones are dropped.
+
+Usage (from the backend directory):
+
+    python -m scripts.archive_reminders
+    python -m scripts.archive_reminders --older-than-days 30 --batch-size 500 --pause 0.1
+"""
+import argparse
+import logging
+import os
+from dotenv import load_dotenv
+from app.database import SessionLocal
+from app.services import reminder_archive
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int,
+                        default=int(os.getenv("REMINDER_ARCHIVE_AFTER_DAYS", "90")))
+    parser.add_argument("--batch-size", type=int,
+                        default=int(os.getenv("REMINDER_ARCHIVE_BATCH_SIZE", str(reminder_archive.DEFAULT_BATCH_SIZE))))
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to wait between batches")
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--partition-months-ahead", type=int,
+                        default=int(os.getenv("REMINDER_PARTITION_MONTHS_AHEAD", "3")))
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+
+    db = SessionLocal()
+    try:
+        archived = reminder_archive.archive_sent_reminders(
+            db, args.older_than_days, args.batch_size, args.pause, args.max_batches
+        )
+        print(f"Archived {archived} reminders")
+
+        if reminder_archive.is_partitioned(db):
+            created = reminder_archive.create_partitions(db, args.partition_months_ahead)
+            dropped = reminder_archive.drop_empty_partitions(
+                db, reminder_archive.archive_cutoff(args.older_than_days)
+            )
+            db.commit()
+            print(f"Created partitions: {', '.join(created) or 'none'}; dropped: {', '.join(dropped) or 'none'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+EXPLAIN-based check that the hot queries use the indexes from the migrations.
+
+Runs EXPLAIN (PostgreSQL) or EXPLAIN QUERY PLAN (SQLite) for each hot query
+against the configured database and fails if the expected index does not
+appear in the plan. On PostgreSQL sequential scans are disabled for the
+check so that small development tables still show whether an index is usable.
+
+Usage (from the backend directory, after `alembic upgrade head`):
+
+    python -m scripts.check_query_plans
+"""
+import sys
+from datetime import date, datetime
+from sqlalchemy import select, text
+from app.database import engine
+from app.models import Reminder, Recommendation, Category
+from app.services.reminder_dispatch import enqueue_due_statement, claim_batch_statement, DEFAULT_BATCH_SIZE
+
+
+def hot_queries():
+    """
+    The query shapes issued by the routes and the delivery worker, paired
+    with the index each one should use. The worker's statements come from
+    app.services.reminder_dispatch itself, so the check follows their changes.
+    """
+    today = date.today()
+    return [
+        (
+            "recommendations by elderly",
+            select(Recommendation).where(Recommendation.elderly_id == 1)
+            .order_by(Recommendation.week, Recommendation.id).limit(100),
+            "ix_recommendations_elderly_id_week",
+        ),
+        (
+            "recommendations by elderly and week",
+            select(Recommendation).where(Recommendation.elderly_id == 1, Recommendation.week == 3)
+            .order_by(Recommendation.week, Recommendation.id).limit(100),
+            "ix_recommendations_elderly_id_week",
+        ),
+        (
+            "recommendations by week",
+            select(Recommendation).where(Recommendation.week == 3)
+            .order_by(Recommendation.week, Recommendation.id).limit(100),
+            "ix_recommendations_week",
+        ),
+        (
+            "recommendations by category",
+            select(Recommendation).where(Recommendation.category == Category.exercicio)
+            .order_by(Recommendation.week, Recommendation.id).limit(100),
+            "ix_recommendations_category_week",
+        ),
+        (
+            "reminders by elderly and date",
+            select(Reminder).where(Reminder.elderly_id == 1, Reminder.scheduled_date == today)
+            .order_by(Reminder.scheduled_date, Reminder.id).limit(100),
+            "ix_reminders_elderly_id_scheduled_date",
+        ),
+        (
+            "unsent reminders",
+            select(Reminder).where(Reminder.sent == False)  # noqa: E712
+            .order_by(Reminder.scheduled_date, Reminder.id).limit(100),
+            "ix_reminders_unsent_scheduled_date",
+        ),
+        (
+            "enqueue due reminders",
+            enqueue_due_statement(today),
+            "ix_reminders_unsent_scheduled_date",
+        ),
+        (
+            "claim queued reminders",
+            claim_batch_statement(DEFAULT_BATCH_SIZE, datetime.now()),
+            "ix_reminders_queued",
+        ),
+    ]
+
+
+def explain(connection, statement):
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return "\n".join(row[-1] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN {compiled}")).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def main():
+    failures = 0
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SET enable_seqscan = off"))
+        for name, statement, index in hot_queries():
+            # EXPLAIN of an UPDATE does not modify any rows, but keep it in a rolled back transaction anyway
+            plan = explain(connection, statement)
+            ok = index in plan
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {name}: expected {index}")
+            if not ok:
+                print("    " + plan.replace("\n", "\n    "))
+        connection.rollback()
+
+    if failures:
+        print(f"{failures} hot queries do not use their index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Rebuild the adherence summary table from the recommendations table.
+
+The summary is maintained incrementally by the API; run this after bulk
+imports or manual SQL changes to recommendations.
+
+Usage (from the backend directory):
+
+    python -m scripts.rebuild_adherence_summary
+"""
+from app.database import SessionLocal
+from app.models import AdherenceSummary
+from app.services import adherence_summary
+from sqlalchemy import select, func
+
+
+def main():
+    db = SessionLocal()
+    try:
+        adherence_summary.rebuild(db)
+        db.commit()
+        groups, total = db.execute(
+            select(func.count(), func.coalesce(func.sum(AdherenceSummary.count), 0))
+        ).one()
+        print(f"Rebuilt adherence summary: {groups} groups covering {total} recommendations")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()